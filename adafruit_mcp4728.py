@@ -28,15 +28,22 @@ Implementation Notes
 __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MCP4728.git"
 
+from array import array
 from struct import pack_into
-from time import sleep
+from time import monotonic, sleep
 
 from adafruit_bus_device import i2c_device
 
 try:
-    from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
     from busio import I2C
+    from circuitpython_typing import ReadableBuffer
     from typing_extensions import Literal
 except ImportError:
     pass
@@ -55,6 +62,43 @@ _MCP4728_GENERAL_CALL_WAKEUP_COMMAND = 0x09
 
 _MCP4728_GENERAL_CALL_SOFTWARE_UPDATE_COMMAND = 0x08
 
+# the longest the DAC can take to program its EEPROM, in seconds
+_MCP4728_EEPROM_WRITE_TIMEOUT = 0.05
+
+# the internal voltage reference, in volts
+_MCP4728_INTERNAL_VREF = 2.048
+
+# seconds between RDY/BSY polls
+_MCP4728_EEPROM_POLL_INTERVAL = 0.001
+
+# bit offsets of each channel field in the mask of changes waiting to be written
+_VALUE_FIELD = 0
+_VREF_FIELD = 4
+_GAIN_FIELD = 8
+_POWER_FIELD = 12
+
+# commands the write planner can choose between
+_FAST_WRITE = 0
+_MULTI_WRITE = 1
+_SELECT_VREF = 2
+_SELECT_GAIN = 3
+
+# the address byte, START and STOP of a transaction cost roughly two bytes of bus time
+_TRANSACTION_COST = 2
+
+# The state of all four channels is packed into ten bytes. The first eight are a Fast Write
+# frame (0 0 PD1 PD0 D11 D10 D9 D8 | D7 ... D0 for channels A to D) and the last two hold the
+# vref and gain bits of channels A to D in the low nibble, as in the select commands
+_STATE_SIZE = 10
+_VREF_BITS = 8
+_GAIN_BITS = 9
+
+# the settings configure() accepts for each channel
+_CONFIGURE_KEYS = ("raw_value", "value", "vref", "gain", "power_down", "udac")
+
+# number of set bits in each four bit channel mask
+_CHANNEL_COUNT = b"\x00\x01\x01\x02\x01\x02\x02\x03\x01\x02\x02\x03\x02\x03\x03\x04"
+
 
 class CV:
     """struct helper"""
@@ -89,12 +133,173 @@ Vref.add_values(
 )
 
 
-class MCP4728:
+class PowerDown(CV):
+    """Options for ``power_down``"""
+
+
+PowerDown.add_values(
+    (
+        ("NORMAL", 0, "Normal operation", None),
+        ("LOAD_1K", 1, "Powered down, 1k ohm to ground", None),
+        ("LOAD_100K", 2, "Powered down, 100k ohm to ground", None),
+        ("LOAD_500K", 3, "Powered down, 500k ohm to ground", None),
+    )
+)
+
+
+class Readback(CV):
+    """Options for ``readback``"""
+
+
+Readback.add_values(
+    (
+        ("FULL", 0, "Output registers and EEPROM", None),
+        ("OUTPUTS", 1, "Output registers", None),
+        ("NONE", 2, "None", None),
+        ("LAZY", 3, "Output registers and EEPROM on first use", None),
+    )
+)
+
+
+# the name of each command, indexed by the top five bits of its first byte
+_COMMAND_NAMES = (
+    ("fast_write",) * 8
+    + ("multi_write", "other", "sequential_write", "single_write")
+    + ("other",) * 4
+    + ("select_vref",) * 4
+    + ("select_power_down",) * 4
+    + ("select_gain",) * 4
+    + ("other",) * 4
+)
+
+
+class IOStats:
+    """Counts the I2C transfers of one or more :class:`MCP4728` and how long they took.
+
+    Transfers are counted by command, as ``"fast_write"``, ``"multi_write"``,
+    ``"sequential_write"``, ``"single_write"``, ``"select_vref"``, ``"select_gain"``,
+    ``"select_power_down"``, ``"general_call"`` or ``"read"``. Latencies are kept in
+    histograms of :attr:`BUCKETS` power of two buckets: bucket ``n`` counts transfers that took
+    less than ``2 ** n`` microseconds, and the last bucket also counts everything longer.
+
+    :param callback: A function called after every transfer with the command name, the bytes
+        written, the bytes read and the time taken in seconds, for passing to a metrics
+        system. Defaults to `None`
+    """
+
+    BUCKETS = 20
+
+    def __init__(self, callback: Optional[Callable[[str, int, int, float], None]] = None) -> None:
+        self.callback = callback
+        self.transactions = {}  # type: Dict[str, int]
+        """The number of transfers of each command, keyed by command name"""
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.eeprom_writes = 0
+        """The number of writes that programmed the EEPROM"""
+        self.write_latency = array("L", [0] * self.BUCKETS)
+        """The histogram of write latencies"""
+        self.read_latency = array("L", [0] * self.BUCKETS)
+        """The histogram of read latencies"""
+
+    def record(self, command: str, written: int, read: int, seconds: float) -> None:
+        """Counts one transfer
+
+        :param str command: The command name
+        :param int written: The number of bytes written
+        :param int read: The number of bytes read
+        :param float seconds: How long the transfer took
+        """
+        self.transactions[command] = self.transactions.get(command, 0) + 1
+        self.bytes_written += written
+        self.bytes_read += read
+        if command in {"sequential_write", "single_write"}:
+            self.eeprom_writes += 1
+        bucket = min(int(seconds * 1000000).bit_length(), self.BUCKETS - 1)
+        if read:
+            self.read_latency[bucket] += 1
+        else:
+            self.write_latency[bucket] += 1
+        if self.callback is not None:
+            self.callback(command, written, read, seconds)
+
+    def merge(self, other: "IOStats") -> None:
+        """Adds the counts of another ``IOStats`` to this one
+
+        :param IOStats other: The counts to add
+        """
+        for command, count in other.transactions.items():
+            self.transactions[command] = self.transactions.get(command, 0) + count
+        self.bytes_written += other.bytes_written
+        self.bytes_read += other.bytes_read
+        self.eeprom_writes += other.eeprom_writes
+        for bucket in range(self.BUCKETS):
+            self.write_latency[bucket] += other.write_latency[bucket]
+            self.read_latency[bucket] += other.read_latency[bucket]
+
+    def reset(self) -> None:
+        """Zeroes all of the counts"""
+        self.transactions.clear()
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.eeprom_writes = 0
+        for bucket in range(self.BUCKETS):
+            self.write_latency[bucket] = 0
+            self.read_latency[bucket] = 0
+
+
+class _InstrumentedI2CDevice:
+    """Wraps an ``I2CDevice`` to record each transfer in an :class:`IOStats`"""
+
+    def __init__(self, device: i2c_device.I2CDevice, stats: IOStats) -> None:
+        self.device = device
+        self.stats = stats
+        self.i2c = device.i2c
+        self.device_address = device.device_address
+
+    def __enter__(self) -> "_InstrumentedI2CDevice":
+        self.device.__enter__()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback) -> bool:
+        return self.device.__exit__(exception_type, exception_value, traceback)
+
+    def readinto(self, buf: bytearray, *, start: int = 0, end: Optional[int] = None) -> None:
+        if end is None:
+            end = len(buf)
+        began = monotonic()
+        self.device.readinto(buf, start=start, end=end)
+        self.stats.record("read", 0, end - start, monotonic() - began)
+
+    def write(self, buf: ReadableBuffer, *, start: int = 0, end: Optional[int] = None) -> None:
+        if end is None:
+            end = len(buf)
+        began = monotonic()
+        self.device.write(buf, start=start, end=end)
+        command = _COMMAND_NAMES[buf[start] >> 3] if end > start else "other"
+        self.stats.record(command, end - start, 0, monotonic() - began)
+
+
+class MCP4728:  # pylint:disable=too-many-instance-attributes
     """Helper library for the Microchip MCP4728 I2C 12-bit Quad DAC.
 
     :param ~busio.I2C i2c_bus: The I2C bus the MCP4728 is connected to.
     :param int address: The I2C device address. Defaults to :const:`0x60`
-
+    :param bool auto_write: Whether channel changes are sent to the DAC immediately. If
+        ``False``, changes are held until :meth:`flush` is called. Defaults to ``True``
+    :param bool suppress_redundant_writes: Whether to skip setting a channel's value, vref or
+        gain to what it is already set to. Skipped writes are counted in
+        :attr:`suppressed_writes`. Defaults to ``False``
+    :param int readback: How the current channel settings are read from the DAC. Must be a
+        ``Readback``. ``Readback.FULL`` reads all 24 bytes of registers and EEPROM when the
+        object is created. ``Readback.OUTPUTS`` reads only as far as channel D's output
+        register, 21 bytes, so the first :meth:`save_settings` rewrites channel D's EEPROM.
+        ``Readback.NONE`` reads nothing and assumes the power-on defaults of a new DAC: all
+        values 0, vref ``Vref.VDD``, gain 1 and normal power, with the EEPROM unknown.
+        ``Readback.LAZY`` puts off the full read until a channel is first used. Defaults to
+        ``Readback.FULL``
+    :param float vdd: The DAC's supply voltage, used to convert :attr:`Channel.voltage` for
+        channels using ``Vref.VDD``. Defaults to :const:`3.3`
 
     **Quickstart: Importing and using the MCP4728**
 
@@ -122,17 +327,118 @@ class MCP4728:
             mcp4728.channel_c.value = int(65535 / 4)  # VDD/4
             mcp4728.channel_d.value = 0  # 0V
 
+        or update all four channels in a single I2C transaction
+
+        .. code-block:: python
+
+            mcp4728.set_values((65535, int(65535 / 2), int(65535 / 4), 0))
+
     """
 
-    def __init__(self, i2c_bus: I2C, address: int = MCP4728_DEFAULT_ADDRESS) -> None:
-        self.i2c_device = i2c_device.I2CDevice(i2c_bus, address)
+    __slots__ = (
+        "i2c_device",
+        "_buffer",
+        "_state",
+        "_eeprom",
+        "_eeprom_known",
+        "_read_pending",
+        "_vdd",
+        "channel_a",
+        "channel_b",
+        "channel_c",
+        "channel_d",
+        "_channels",
+        "auto_write",
+        "suppress_redundant_writes",
+        "suppressed_writes",
+        "_batch_depth",
+        "_pending",
+        "stats",
+        "recorder",
+    )
 
-        raw_registers = self._read_registers()
+    def __init__(
+        self,
+        i2c_bus: I2C,
+        address: int = MCP4728_DEFAULT_ADDRESS,
+        auto_write: bool = True,
+        suppress_redundant_writes: bool = False,
+        readback: int = Readback.FULL,
+        vdd: float = 3.3,
+    ) -> None:
+        if not Readback.is_valid(readback):
+            raise AttributeError("readback must be a `Readback`")
+        self.i2c_device = i2c_device.I2CDevice(i2c_bus, address)
+        # every command is built in this buffer so writing doesn't allocate; it is sized for
+        # the 24 byte register read, the largest transfer
+        self._buffer = bytearray(24)
+        # the channels hold no state of their own, they read and write their part of this
+        self._state = bytearray(_STATE_SIZE)
+        # the EEPROM contents as Multi-Write data bytes, used to skip saves that change nothing
+        self._eeprom = bytearray(8)
+        # mask of the channels whose EEPROM contents are known
+        self._eeprom_known = 0
+        self._read_pending = readback == Readback.LAZY
+        self._vdd = vdd
+
+        self.channel_a = Channel(self, 0)
+        self.channel_b = Channel(self, 1)
+        self.channel_c = Channel(self, 2)
+        self.channel_d = Channel(self, 3)
+        self._channels = (self.channel_a, self.channel_b, self.channel_c, self.channel_d)
+
+        if readback == Readback.FULL:
+            self._read_registers()
+        elif readback == Readback.OUTPUTS:
+            self._read_registers(21)
+
+        self.auto_write = auto_write
+        self.suppress_redundant_writes = suppress_redundant_writes
+        self.suppressed_writes = 0
+        """The number of channel writes skipped because they would not change anything"""
+        self._batch_depth = 0
+        self._pending = 0
+        self.stats = None
+        """The :class:`IOStats` counting this device's transfers, or `None` when disabled"""
+        self.recorder = None
+        """A :class:`adafruit_mcp4728_trace.TraceRecorder` that every frame written to the DAC
+        is recorded in, or `None` to not record"""
+
+    def enable_stats(
+        self, callback: Optional[Callable[[str, int, int, float], None]] = None
+    ) -> IOStats:
+        """Starts counting this device's I2C transfers, returning the :class:`IOStats` they
+        are counted in. While disabled, which is the default, transfers are not timed or
+        counted at all.
+
+        :param callback: A function called after every transfer. See :class:`IOStats`
+        """
+        if self.stats is None:
+            self.stats = IOStats(callback)
+            self.i2c_device = _InstrumentedI2CDevice(self.i2c_device, self.stats)
+        else:
+            self.stats.callback = callback
+        return self.stats
+
+    def disable_stats(self) -> None:
+        """Stops counting this device's I2C transfers"""
+        if self.stats is not None:
+            self.i2c_device = self.i2c_device.device
+            self.stats = None
 
-        self.channel_a = Channel(self, self._cache_page(*raw_registers[0]), 0)
-        self.channel_b = Channel(self, self._cache_page(*raw_registers[1]), 1)
-        self.channel_c = Channel(self, self._cache_page(*raw_registers[2]), 2)
-        self.channel_d = Channel(self, self._cache_page(*raw_registers[3]), 3)
+    @property
+    def vdd(self) -> float:
+        """The DAC's supply voltage, used to convert :attr:`Channel.voltage` for channels using
+        ``Vref.VDD``"""
+        return self._vdd
+
+    @vdd.setter
+    def vdd(self, value: float) -> None:
+        if value <= 0:
+            raise AttributeError("`vdd` must be greater than 0")
+        self._vdd = value
+        for channel in self._channels:
+            channel._scale = None  # pylint:disable=protected-access
 
     @staticmethod
     def _get_flags(high_byte: int) -> Tuple[int, int, int]:
@@ -141,115 +447,807 @@ class MCP4728:
         power_state = (high_byte & 0b011 << 5) >> 5
         return (vref, gain, power_state)
 
-    @staticmethod
-    def _cache_page(value: int, vref: int, gain: int, power_state: int) -> Dict[str, int]:
-        return {"value": value, "vref": vref, "gain": gain, "power_state": power_state}
-
-    def _read_registers(self) -> List[Tuple[int, int, int, int]]:
-        buf = bytearray(24)
+    def _read_registers(self, length: int = 24) -> None:
+        buf = self._buffer
 
         with self.i2c_device as i2c:
-            i2c.readinto(buf)
+            i2c.readinto(buf, end=length)
+        # a shorter read leaves some channels unknown, so a deferred read is still needed
+        if length >= 21:
+            self._read_pending = False
 
         # stride is 6 because we get 6 bytes for each channel; 3 for the output regs
-        # and 3 for the eeprom. Here we only care about the output register so we throw out
-        # the eeprom values as 'n/a'
-        current_values = []
-        # pylint:disable=unused-variable
-        for header, high_byte, low_byte, na_1, na_2, na_3 in self._chunk(buf, 6):
-            # pylint:enable=unused-variable
-            value = (high_byte & 0b00001111) << 8 | low_byte
+        # and 3 for the eeprom. The eeprom data bytes are kept as they are, to compare
+        # against when saving. A shorter read stops part way through the channels
+        state = self._state
+        for index in range(4):
+            start = index * 6
+            if start + 3 > length:
+                break
+            high_byte = buf[start + 1]
             vref, gain, power_state = self._get_flags(high_byte)
-            current_values.append((value, vref, gain, power_state))
+            state[index * 2] = power_state << 4 | high_byte & 0b00001111
+            state[index * 2 + 1] = buf[start + 2]
+            self._store_bit(_VREF_BITS, index, vref)
+            self._store_bit(_GAIN_BITS, index, gain)
+
+            if start + 6 > length:
+                break
+            self._eeprom[index * 2] = buf[start + 4]
+            self._eeprom[index * 2 + 1] = buf[start + 5]
+            self._eeprom_known |= 1 << index
+
+    def refresh(self, channels: int = 4, eeprom: bool = False) -> None:
+        """Reads the current settings of the first ``channels`` channels back from the DAC,
+        replacing the driver's cached value, vref, gain and power-down mode for each. Changes
+        to those channels that have not been flushed yet are discarded.
+
+        :param int channels: The number of channels to read, starting from channel A. Reading
+            fewer channels makes a shorter transfer. Defaults to :const:`4`
+        :param bool eeprom: Whether to also read the EEPROM of the last channel read. The
+            EEPROM of the channels before it is always read. Defaults to ``False``
+        """
+        length = self._readback_length(channels) + (3 if eeprom else 0)
+        self._read_registers(length)
+        channel_mask = (1 << channels) - 1
+        self._pending &= ~(
+            channel_mask << _VALUE_FIELD
+            | channel_mask << _VREF_FIELD
+            | channel_mask << _GAIN_FIELD
+            | channel_mask << _POWER_FIELD
+        )
+
+    def verify(self, channels: int = 4) -> List["Channel"]:
+        """Reads the output registers of the first ``channels`` channels back from the DAC and
+        returns the channels whose value, vref, gain or power-down mode differ from the
+        driver's. The driver's cached settings are left as they are; use :meth:`refresh` to
+        replace them with the DAC's.
+
+        :param int channels: The number of channels to check, starting from channel A.
+            Checking fewer channels makes a shorter transfer. Defaults to :const:`4`
+        """
+        length = self._readback_length(channels)
+        self._load()
+        buf = self._buffer
+        with self.i2c_device as i2c:
+            i2c.readinto(buf, end=length)
 
-        return current_values
+        state = self._state
+        mismatched = []
+        for channel in self._channels[:channels]:
+            index = channel.channel_index
+            high_byte = buf[index * 6 + 1]
+            vref, gain, power_state = self._get_flags(high_byte)
+            if (
+                state[index * 2] != power_state << 4 | high_byte & 0b00001111
+                or state[index * 2 + 1] != buf[index * 6 + 2]
+                or vref != channel.vref
+                or gain != channel.gain
+            ):
+                mismatched.append(channel)
+        return mismatched
 
-    def save_settings(self) -> None:
-        """Saves the currently selected values, Vref, and gain selections for each channel
-        to the EEPROM, setting them as defaults on power up"""
-        byte_list = []
-        byte_list += self._generate_bytes_with_flags(self.channel_a)
-        byte_list += self._generate_bytes_with_flags(self.channel_b)
-        byte_list += self._generate_bytes_with_flags(self.channel_c)
-        byte_list += self._generate_bytes_with_flags(self.channel_d)
-        self._write_multi_eeprom(byte_list)
+    @staticmethod
+    def _readback_length(channels: int) -> int:
+        """The number of bytes to read to reach the output register of the last channel"""
+        if channels < 1 or channels > 4:
+            raise AttributeError("`channels` must be between 1 and 4")
+        return channels * 6 - 3
 
-    # TODO: add the ability to set an offset
-    def _write_multi_eeprom(self, byte_list: List[int]) -> None:
-        buffer_list = [_MCP4728_CH_A_MULTI_EEPROM]
-        buffer_list += byte_list
+    def _load(self) -> None:
+        """Reads the registers if that was put off until a channel was first used"""
+        if self._read_pending:
+            self._read_registers()
 
-        buf = bytearray(buffer_list)
+    def save_settings(self) -> None:
+        """Saves the currently selected values, Vref, and gain selections for each channel
+        to the EEPROM, setting them as defaults on power up.
+
+        Only the channels from the first one that differs from the EEPROM onwards are
+        written, nothing is written if the EEPROM already matches, and this returns as soon as
+        the DAC reports that the write is complete"""
+        if not self._write_multi_eeprom():
+            return
+        deadline = monotonic() + _MCP4728_EEPROM_WRITE_TIMEOUT
+        while not self._eeprom_ready():
+            if monotonic() > deadline:
+                raise RuntimeError("Timed out waiting for the EEPROM write to complete")
+            sleep(_MCP4728_EEPROM_POLL_INTERVAL)
+
+    def _write_multi_eeprom(self) -> bool:
+        """Writes the channels that differ from the EEPROM, returning ``False`` if there were
+        none"""
+        self._load()
+        buf = self._buffer
+        eeprom = self._eeprom
+        first = None
+        for channel in self._channels:
+            offset = 1 + channel.channel_index * 2
+            self._pack_channel(buf, offset, channel)
+            if first is not None:
+                continue
+            if (
+                not self._eeprom_known & 1 << channel.channel_index
+                or buf[offset : offset + 2] != eeprom[offset - 1 : offset + 1]
+            ):
+                first = channel.channel_index
+        if first is None:
+            return False
+
+        # the sequential write starts at the given channel and carries on through channel D
+        offset = first * 2
+        buf[offset] = _MCP4728_CH_A_MULTI_EEPROM | first << 1
 
         with self.i2c_device as i2c:
-            i2c.write(buf)
-
-        sleep(0.015)  # the better to write you with
+            i2c.write(buf, start=offset, end=9)
+        eeprom[offset:] = buf[offset + 1 : 9]
+        self._eeprom_known = 0b1111
+        # the write also sets the outputs of the channels it covers, sending any of their
+        # changes that were being held back
+        written = 0b1111 & ~((1 << first) - 1)
+        self._pending &= ~(
+            written * (1 << _VALUE_FIELD | 1 << _VREF_FIELD | 1 << _GAIN_FIELD | 1 << _POWER_FIELD)
+        )
+        if self.recorder is not None:
+            self.recorder.record(self._state)
+        return True
+
+    def _eeprom_ready(self) -> bool:
+        # the first byte read back starts with the RDY/BSY bit, which is clear while the
+        # EEPROM is being written
+        buf = self._buffer
+        with self.i2c_device as i2c:
+            i2c.readinto(buf, end=1)
+        return bool(buf[0] & 0b10000000)
 
     def sync_vrefs(self) -> None:
         """Syncs the driver's vref state with the DAC"""
-        gain_setter_command = 0b10000000
-        gain_setter_command |= self.channel_a.vref << 3
-        gain_setter_command |= self.channel_b.vref << 2
-        gain_setter_command |= self.channel_c.vref << 1
-        gain_setter_command |= self.channel_d.vref
-
-        buf = bytearray(1)
-        pack_into(">B", buf, 0, gain_setter_command)
+        self._load()
+        gain_setter_command = 0b10000000  # 1 0 0 X VA VB VC VD
+        gain_setter_command |= self._state[_VREF_BITS]
+
+        buf = self._buffer
+        buf[0] = gain_setter_command
         with self.i2c_device as i2c:
-            i2c.write(buf)
+            i2c.write(buf, end=1)
 
     def sync_gains(self) -> None:
         """Syncs the driver's gain state with the DAC"""
 
-        sync_setter_command = 0b11000000
-        sync_setter_command |= self.channel_a.gain << 3
-        sync_setter_command |= self.channel_b.gain << 2
-        sync_setter_command |= self.channel_c.gain << 1
-        sync_setter_command |= self.channel_d.gain
+        self._load()
+        sync_setter_command = 0b11000000  # 1 1 0 X GA GB GC GD
+        sync_setter_command |= self._state[_GAIN_BITS]
 
-        buf = bytearray(1)
-        pack_into(">B", buf, 0, sync_setter_command)
+        buf = self._buffer
+        buf[0] = sync_setter_command
 
         with self.i2c_device as i2c:
-            i2c.write(buf)
+            i2c.write(buf, end=1)
 
-    def _set_value(self, channel: "Channel") -> None:
-        channel_bytes = self._generate_bytes_with_flags(channel)
+    def sync_power_downs(self) -> None:
+        """Syncs the driver's power-down state with the DAC"""
+        self._load()
+        state = self._state
+        # 1 0 1 X PD1A PD0A PD1B PD0B | PD1C PD0C PD1D PD0D X X X X
+        buf = self._buffer
+        buf[0] = 0b10100000 | (state[0] & 0b00110000) >> 2 | (state[2] & 0b00110000) >> 4
+        buf[1] = (state[4] & 0b00110000) << 2 | state[6] & 0b00110000
 
-        write_command_byte = 0b01000000  # 0 1 0 0 0 DAC1 DAC0 UDAC
-        write_command_byte |= channel.channel_index << 1
+        with self.i2c_device as i2c:
+            i2c.write(buf, end=2)
+
+    def set_power_down(self, modes: Sequence[int]) -> None:
+        """Sets the power-down mode of all four channels at once. Unless other changes are
+        waiting to be written, this is sent as a single two byte Write Power-Down Select
+        command.
+
+        :param modes: The four ``PowerDown`` modes, in channel order A to D
+        """
+        if len(modes) != 4:
+            raise AttributeError("`modes` must contain one mode for each of the four channels")
+        for mode in modes:
+            if not PowerDown.is_valid(mode):
+                raise AttributeError("power_down must be a `PowerDown`")
+        changes = 0
+        for channel, mode in zip(self._channels, modes):
+            if self._redundant(channel.power_down, mode):
+                continue
+            self._store_power_down(channel.channel_index, mode)
+            changes |= 1 << (_POWER_FIELD + channel.channel_index)
+        if changes:
+            self._queue(changes)
 
-        output_buffer = bytearray([write_command_byte])
-        output_buffer.extend(channel_bytes)
+    def _set_value(self, channel: "Channel") -> None:
+        self._queue(1 << (_VALUE_FIELD + channel.channel_index))
+
+    def _multi_write(self, channel_mask: int, udac_mask: int = 0) -> None:
+        # Multi-Write: the command byte and two data bytes are repeated for each channel
+        # so any number of channels can be written in the same transaction, each with its
+        # own UDAC bit
+        buf = self._buffer
+        end = 0
+        for channel in self._channels:
+            if not channel_mask & 1 << channel.channel_index:
+                continue
+            write_command_byte = 0b01000000  # 0 1 0 0 0 DAC1 DAC0 UDAC
+            write_command_byte |= channel.channel_index << 1
+            write_command_byte |= udac_mask >> channel.channel_index & 1
+
+            buf[end] = write_command_byte
+            self._pack_channel(buf, end + 1, channel)
+            end += 3
 
         with self.i2c_device as i2c:
-            i2c.write(output_buffer)
+            i2c.write(buf, end=end)
+
+    def batch(self) -> "_Batch":
+        """Returns a context manager that holds back channel changes until it exits.
+
+        Within the block the channels' ``raw_value``, ``value``, ``gain`` and ``vref`` can be
+        set as usual, but nothing is sent to the DAC. Only the last change made to each
+        channel is kept, and on exit every changed channel is written in one Multi-Write
+        transaction with the UDAC bit set, whatever :attr:`auto_write` is. All outputs are then
+        updated together by :meth:`soft_update`, avoiding the intermediate output states of
+        updating one channel at a time.
+
+        .. note::
+            :meth:`soft_update` is an I2C general call, so any other MCP4728 on the bus with
+            pending updates will also latch its outputs.
+
+        .. code-block:: python
+
+            with mcp4728.batch():
+                mcp4728.channel_a.value = 65535
+                mcp4728.channel_b.value = 0
+        """
+        return _Batch(self)
+
+    def _begin_batch(self) -> None:
+        self._batch_depth += 1
+
+    def _end_batch(self) -> None:
+        self._batch_depth -= 1
+        if self._batch_depth or not self._pending:
+            return
+        self._flush(udac=1)
+        self.soft_update()
+
+    def _queue(self, changes: int) -> None:
+        """Marks channel fields as changed, and sends them unless writes are being held"""
+        self._pending |= changes
+        if self.auto_write and not self._batch_depth:
+            self._flush()
+
+    def _redundant(self, current: int, value: int) -> bool:
+        """Returns ``True``, counting the skipped write, if redundant writes are suppressed
+        and ``value`` is the same as the ``current`` cached value"""
+        if value != current or not self.suppress_redundant_writes:
+            return False
+        self.suppressed_writes += 1
+        return True
+
+    def flush(self) -> None:
+        """Sends any channel changes that have not been written to the DAC yet. The changes
+        are sent with whichever combination of Fast Write, Multi-Write and Vref/gain select
+        commands puts the fewest bytes on the bus. Only needed if :attr:`auto_write` is
+        ``False``"""
+        self._flush()
+
+    def _flush(self, udac: int = 0, held: int = 0) -> None:
+        # the ``held`` pending fields are left to be sent later
+        pending = self._pending & ~held
+        if not pending:
+            return
+        self._pending &= held
+
+        values = pending >> _VALUE_FIELD & 0b1111
+        vrefs = pending >> _VREF_FIELD & 0b1111
+        gains = pending >> _GAIN_FIELD & 0b1111
+        powers = pending >> _POWER_FIELD & 0b1111
+
+        # Multi-Write carries everything about each channel it writes, and is the only
+        # command here that can hold the outputs back with the UDAC bit
+        fast = False
+        multi = values | vrefs | gains | powers
+        select_vrefs = select_gains = select_powers = 0
+        if not udac:
+            cost = self._write_cost(False, multi, 0, 0, 0)
+            # the other changes of channels whose values are written come for free
+            option = self._write_cost(
+                False, values, vrefs & ~values, gains & ~values, powers & ~values
+            )
+            if option < cost:
+                cost = option
+                multi = values
+                select_vrefs = vrefs & ~values
+                select_gains = gains & ~values
+                select_powers = powers & ~values
+            # Fast Write always sends all four values and power-down modes, so it would send
+            # held ones too, and can't set vref or gain
+            held_frame = (held >> _VALUE_FIELD | held >> _POWER_FIELD) & 0b1111
+            if (values or powers) and not held_frame:
+                option = self._write_cost(True, 0, vrefs, gains, 0)
+                if option < cost:
+                    fast = True
+                    multi = 0
+                    select_vrefs = vrefs
+                    select_gains = gains
+                    select_powers = 0
+
+        if fast:
+            self._fast_write()
+        if multi:
+            self._multi_write(multi, 0b1111 if udac else 0)
+        if select_vrefs:
+            self.sync_vrefs()
+        if select_gains:
+            self.sync_gains()
+        if select_powers:
+            self.sync_power_downs()
+        if self.recorder is not None and (values or powers):
+            self.recorder.record(self._state)
 
     @staticmethod
-    def _generate_bytes_with_flags(channel: "Channel") -> bytearray:
-        buf = bytearray(2)
-        pack_into(">H", buf, 0, channel.raw_value)
+    def _write_cost(fast: bool, multi: int, vrefs: int, gains: int, powers: int) -> int:
+        """Estimates the bus time, in bytes, of sending a Fast Write, a Multi-Write of the
+        ``multi`` channels, and the vref, gain and power-down select commands"""
+        cost = 0
+        if fast:
+            cost += _TRANSACTION_COST + 8
+        if multi:
+            cost += _TRANSACTION_COST + 3 * _CHANNEL_COUNT[multi]
+        if vrefs:
+            cost += _TRANSACTION_COST + 1
+        if gains:
+            cost += _TRANSACTION_COST + 1
+        if powers:
+            cost += _TRANSACTION_COST + 2
+        return cost
+
+    def set_raw_values(self, values: Sequence[int]) -> None:
+        """Sets the native 12-bit values of all four channels at once using the DAC's
+        Fast Write command, sending the whole update in a single I2C transaction.
+
+        :param values: The four 12-bit values, in channel order A to D
+        """
+        if len(values) != 4:
+            raise AttributeError("`values` must contain one value for each of the four channels")
+        for value in values:
+            if value < 0 or value > (2**12 - 1):
+                raise AttributeError(
+                    f"`raw_value` must be a 12-bit integer between 0 and {(2**12 - 1)}"
+                )
+        changes = 0
+        for channel, value in zip(self._channels, values):
+            if self._redundant(channel.raw_value, value):
+                continue
+            self._store_value(channel.channel_index, value)
+            changes |= 1 << (_VALUE_FIELD + channel.channel_index)
+        if changes:
+            self._queue(changes)
+
+    def set_values(self, values: Sequence[int]) -> None:
+        """Sets the 16-bit scaled values of all four channels at once using the DAC's
+        Fast Write command. Note that the MCP4728 is a 12-bit piece so quantization errors
+        will occur
+
+        :param values: The four 16-bit values, in channel order A to D
+        """
+        if len(values) != 4:
+            raise AttributeError("`values` must contain one value for each of the four channels")
+        for value in values:
+            if value < 0 or value > (2**16 - 1):
+                raise AttributeError(
+                    f"`value` must be a 16-bit integer between 0 and {(2**16 - 1)}"
+                )
+        self.set_raw_values([value >> 4 for value in values])
+
+    def ramp(
+        self,
+        targets: Sequence[Optional[int]],
+        duration: Optional[float] = None,
+        slew_rate: Optional[float] = None,
+    ) -> None:
+        """Moves channels smoothly from their current raw values to new ones, returning once
+        they get there.
+
+        The ramp is made of the smallest steps the channel moving furthest can take, one code
+        at a time. A step is only written if it changes a code, and every channel that changes
+        in the same step goes out in the same write, as a Fast Write frame when three or more
+        channels change. If the bus can't keep up, steps are skipped to stay on time. The
+        ramping channels are written as the ramp goes, whatever :attr:`auto_write` is, while
+        any other changes held back by it stay held. Ramps can't be made inside
+        :meth:`batch`, which holds back every write.
+
+        :param targets: The four 12-bit raw values to ramp to, in channel order A to D. Use
+            `None` for a channel that should stay where it is
+        :param float duration: How long the ramp should take, in seconds
+        :param float slew_rate: How fast the channel moving furthest should change, in raw
+            codes per second. Used to work out the duration if that isn't given
+        """
+        if self._batch_depth:
+            raise RuntimeError("ramp() can't be used inside batch()")
+        if len(targets) != 4:
+            raise AttributeError("`targets` must contain one value for each of the four channels")
+        for target in targets:
+            if target is not None and (target < 0 or target > (2**12 - 1)):
+                raise AttributeError(
+                    f"`raw_value` must be a 12-bit integer between 0 and {(2**12 - 1)}"
+                )
+        starts = [channel.raw_value for channel in self._channels]
+        deltas = [0 if target is None else target - start for start, target in zip(starts, targets)]
+        steps = max(abs(delta) for delta in deltas)
+        if duration is None:
+            if slew_rate is None or slew_rate <= 0:
+                raise AttributeError("either `duration` or a positive `slew_rate` is needed")
+            duration = steps / slew_rate
+        if duration < 0:
+            raise AttributeError("`duration` must not be negative")
+        if not steps:
+            return
+
+        start_time = monotonic()
+        step = 0
+        while step < steps:
+            now = monotonic()
+            # the step that should be showing now, skipping any the bus didn't keep up with
+            due = steps if duration <= 0 else int((now - start_time) / duration * steps)
+            if due <= step:
+                sleep(max(start_time + duration * (step + 1) / steps - now, 0))
+                continue
+            step = min(due, steps)
+
+            changes = 0
+            for channel, start, delta in zip(self._channels, starts, deltas):
+                raw_value = start + (delta * step * 2 + steps) // (steps * 2)
+                if delta and raw_value != channel.raw_value:
+                    self._store_value(channel.channel_index, raw_value)
+                    changes |= 1 << (_VALUE_FIELD + channel.channel_index)
+            if changes:
+                held = self._pending & ~changes
+                self._pending |= changes
+                self._flush(held=held)
+
+    def configure(self, channels: Dict[Union[int, "Channel"], Dict[str, int]]) -> None:
+        """Sets any of the value, vref, gain and power-down mode of several channels together,
+        sending all of them in a single Multi-Write transaction.
+
+        :param dict channels: The settings for each channel to change, keyed by the
+            :class:`Channel` or its index. Each channel's settings are a `dict` that may hold
+            one of ``raw_value`` and ``value``, ``vref``, ``gain`` and ``power_down``, with the
+            same meanings as the :class:`Channel` properties, and ``udac``. If ``udac`` is
+            ``True`` the channel's output is not updated until :meth:`soft_update` is called
 
-        buf[0] |= channel.vref << 7
-        buf[0] |= channel.gain << 4
+        .. code-block:: python
 
-        return buf
+            mcp4728.configure(
+                {
+                    mcp4728.channel_a: {"raw_value": 4095, "vref": Vref.INTERNAL, "gain": 2},
+                    mcp4728.channel_b: {"value": 32768, "vref": Vref.VDD},
+                }
+            )
+
+        If writes are being held back, by :attr:`auto_write` or :meth:`batch`, the changes are
+        held with the rest and ``udac`` has no effect.
+        """
+        self._load()
+        settings = []
+        for key, channel_settings in channels.items():
+            index = key.channel_index if isinstance(key, Channel) else key
+            if index not in {0, 1, 2, 3}:
+                raise AttributeError("channels must be a `Channel` or an index from 0 to 3")
+            for name in channel_settings:
+                if name not in _CONFIGURE_KEYS:
+                    raise AttributeError(f"`{name}` is not a channel setting")
+            if "value" in channel_settings and "raw_value" in channel_settings:
+                raise AttributeError("only one of `value` and `raw_value` can be given")
+            raw_value = channel_settings.get("raw_value")
+            if "value" in channel_settings:
+                value = channel_settings["value"]
+                if value < 0 or value > (2**16 - 1):
+                    raise AttributeError(
+                        f"`value` must be a 16-bit integer between 0 and {(2**16 - 1)}"
+                    )
+                raw_value = value >> 4
+            if raw_value is not None and (raw_value < 0 or raw_value > (2**12 - 1)):
+                raise AttributeError(
+                    f"`raw_value` must be a 12-bit integer between 0 and {(2**12 - 1)}"
+                )
+            vref = channel_settings.get("vref")
+            if vref is not None and not Vref.is_valid(vref):
+                raise AttributeError("range must be a `Vref`")
+            gain = channel_settings.get("gain")
+            if gain is not None and gain not in {1, 2}:
+                raise AttributeError("`gain` must be 1 or 2")
+            power_down = channel_settings.get("power_down")
+            if power_down is not None and not PowerDown.is_valid(power_down):
+                raise AttributeError("power_down must be a `PowerDown`")
+            settings.append((index, raw_value, vref, gain, power_down, channel_settings))
+
+        # everything is checked before anything changes
+        channel_mask = udac_mask = 0
+        for index, raw_value, vref, gain, power_down, channel_settings in settings:
+            if self.suppress_redundant_writes and not self._changes_channel(
+                index, raw_value, vref, gain, power_down
+            ):
+                self.suppressed_writes += 1
+                continue
+            if raw_value is not None:
+                self._store_value(index, raw_value)
+            if vref is not None:
+                self._store_bit(_VREF_BITS, index, vref)
+            if gain is not None:
+                self._store_bit(_GAIN_BITS, index, gain - 1)
+            if power_down is not None:
+                self._store_power_down(index, power_down)
+            channel_mask |= 1 << index
+            if channel_settings.get("udac"):
+                udac_mask |= 1 << index
+        if not channel_mask:
+            return
+
+        fields = channel_mask * (
+            1 << _VALUE_FIELD | 1 << _VREF_FIELD | 1 << _GAIN_FIELD | 1 << _POWER_FIELD
+        )
+        if not self.auto_write or self._batch_depth:
+            self._pending |= fields
+            return
+        self._multi_write(channel_mask, udac_mask)
+        # the Multi-Write sent everything about these channels, including earlier changes
+        self._pending &= ~fields
+        if self.recorder is not None:
+            self.recorder.record(self._state)
+
+    def _changes_channel(
+        self,
+        index: int,
+        raw_value: Optional[int],
+        vref: Optional[int],
+        gain: Optional[int],
+        power_down: Optional[int],
+    ) -> bool:
+        """Returns ``True`` if any of the given settings differ from the channel's cached
+        ones. Settings that are `None` are left as they are"""
+        channel = self._channels[index]
+        return (
+            (raw_value is not None and raw_value != channel.raw_value)
+            or (vref is not None and vref != channel.vref)
+            or (gain is not None and gain - 1 != channel.gain)
+            or (power_down is not None and power_down != channel.power_down)
+        )
+
+    def _store_bit(self, bits: int, index: int, value: int) -> None:
+        # channel A is the high bit of the vref and gain nibbles
+        bit = 3 - index
+        self._state[bits] = self._state[bits] & ~(1 << bit) | value << bit
+        # the channel's voltage scale depends on its vref and gain
+        self._channels[index]._scale = None  # pylint:disable=protected-access
+
+    def _store_value(self, index: int, value: int) -> None:
+        state = self._state
+        state[index * 2] = state[index * 2] & 0b00110000 | value >> 8
+        state[index * 2 + 1] = value & 0xFF
+
+    def _store_power_down(self, index: int, mode: int) -> None:
+        state = self._state
+        state[index * 2] = state[index * 2] & 0b00001111 | mode << 4
+
+    def _fast_write(self) -> None:
+        # the state starts with a ready to send Fast Write frame for all four channels
+        with self.i2c_device as i2c:
+            i2c.write(self._state, end=8)
+
+    def stream(
+        self,
+        frames: Union[Iterable[Sequence[int]], ReadableBuffer],
+        chunk_size: int = 32,
+    ) -> None:
+        """Plays a sequence of four channel samples as fast as the I2C bus allows.
+
+        The DAC accepts repeated Fast Write frames within a single I2C write, so samples
+        are packed ``chunk_size`` frames at a time into one write each, and the bus is held
+        for the whole stream.
+
+        :param frames: Either an iterable of 12-bit ``(a, b, c, d)`` samples, a buffer of
+            12-bit integer samples such as an `array.array` or NumPy array, either flat or in
+            rows of four, or a bytes-like object of already packed 8-byte Fast Write frames
+        :param int chunk_size: The number of frames to send in each I2C write. Defaults
+            to :const:`32`
+        """
+        if chunk_size < 1:
+            raise AttributeError("`chunk_size` must be at least 1")
+        self._load()
+
+        packed, frames = self._split_frames(frames)
+        if packed is not None:
+            if not packed:
+                return
+            chunk_bytes = chunk_size * 8
+            recorder = self.recorder
+            with self.i2c_device as i2c:
+                for start in range(0, len(packed), chunk_bytes):
+                    end = min(start + chunk_bytes, len(packed))
+                    i2c.write(packed, start=start, end=end)
+                    if recorder is not None:
+                        recorder.record(packed, start, end)
+            last_frame = packed[-8:]
+        else:
+            power_bits = self._power_bits()
+            buf = bytearray(chunk_size * 8)
+            offset = 0
+            recorder = self.recorder
+            with self.i2c_device as i2c:
+                for frame in frames:
+                    if offset == len(buf):
+                        i2c.write(buf)
+                        if recorder is not None:
+                            recorder.record(buf, 0, offset)
+                        offset = 0
+                    self._pack_raw_frame(buf, offset, frame, power_bits)
+                    offset += 8
+                if not offset:
+                    return
+                i2c.write(buf, end=offset)
+                if recorder is not None:
+                    recorder.record(buf, 0, offset)
+            last_frame = buf[offset - 8 : offset]
+
+        # keep the cache in step with what the DAC is now outputting
+        self._state[0:8] = last_frame
 
     @staticmethod
-    def _chunk(big_list: bytearray, chunk_size: int) -> Iterator[bytearray]:
-        """Divides a given list into `chunk_size` sized chunks"""
-        for i in range(0, len(big_list), chunk_size):
-            yield big_list[i : i + chunk_size]
+    def _split_frames(
+        frames: Union[Iterable[Sequence[int]], ReadableBuffer],
+    ) -> Tuple[Optional[memoryview], Optional[Iterable[Sequence[int]]]]:
+        """Sorts ``frames`` into packed Fast Write frames, returned first as a byte
+        `memoryview`, or samples, returned second as rows of four values"""
+        try:
+            view = memoryview(frames)
+        except TypeError:
+            return None, frames
+
+        # only buffers of bytes hold packed frames; any other buffer holds samples. Views
+        # without a format, as on CircuitPython, are taken to be bytes
+        data_format = getattr(view, "format", "B")
+        if data_format in {"B", "b", "c"}:
+            if getattr(view, "ndim", 1) > 1:
+                view = view.cast("B")
+            if len(view) % 8:
+                raise AttributeError("packed `frames` must be a multiple of 8 bytes long")
+            return view, None
+        if data_format[-1:] in {"e", "f", "d"}:
+            raise AttributeError("sample buffers must hold 12-bit integers")
+        if view.ndim == 1:
+            if len(view) % 4:
+                raise AttributeError("flat sample buffers must contain four values per frame")
+            flat = view.tolist()
+            return None, [flat[index : index + 4] for index in range(0, len(flat), 4)]
+        if view.ndim == 2 and view.shape[1] == 4:
+            return None, view.tolist()
+        raise AttributeError("sample buffers must be flat or have rows of four values")
+
+    def _power_bits(self) -> List[int]:
+        """The power-down bits of each channel as they sit in a 16-bit Fast Write word, so
+        that packed samples keep each channel's current power-down mode"""
+        state = self._state
+        return [(state[index] & 0b00110000) << 8 for index in range(0, 8, 2)]
 
-    def _general_call(self, byte_command: int) -> None:
-        buffer_list = [_MCP4728_GENERAL_CALL_ADDRESS]
-        buffer_list += [byte_command]
+    @staticmethod
+    def _pack_raw_frame(
+        buf: bytearray, offset: int, frame: Sequence[int], power_bits: List[int]
+    ) -> None:
+        if len(frame) != 4:
+            raise AttributeError("each frame must contain one value per channel")
+        for value, power in zip(frame, power_bits):
+            if value < 0 or value > (2**12 - 1):
+                raise AttributeError(
+                    f"`raw_value` must be a 12-bit integer between 0 and {(2**12 - 1)}"
+                )
+            pack_into(">H", buf, offset, value | power)
+            offset += 2
+
+    def pack_frames(self, samples: Sequence[Any], voltage: bool = False) -> bytearray:
+        """Converts a block of four channel samples into packed Fast Write frames, ready to
+        pass to :meth:`stream`. Values outside the range of the DAC are clipped.
+
+        Samples are converted with each channel's current settings, as :attr:`Channel.voltage`
+        or :attr:`Channel.normalized_value` would, and carry its current power-down mode.
+        Fast Write frames can't change the vref or gain, so those need to be set first. The
+        conversion is done in one pass by NumPy if it is installed, and one sample at a time
+        otherwise.
+
+        :param samples: The samples, either as rows of ``(a, b, c, d)`` values or as a flat
+            sequence such as an `array.array` or NumPy array with four values per frame
+        :param bool voltage: Whether the samples are voltages rather than normalized values
+            from 0.0 to 1.0. Defaults to ``False``
+        """
+        self._load()
+        if np is not None:
+            return self._pack_frames_numpy(samples, voltage)
+
+        flat = not len(samples) or isinstance(samples[0], (int, float))
+        if flat and len(samples) % 4:
+            raise AttributeError("flat `samples` must contain four values per frame")
+        frames = len(samples) // 4 if flat else len(samples)
+        buf = bytearray(frames * 8)
+        state = self._state
+        channels = self._channels
+        offset = 0
+        for frame in range(frames):
+            if not flat and len(samples[frame]) != 4:
+                raise AttributeError("each frame must contain one value per channel")
+            for index in range(4):
+                sample = samples[frame * 4 + index] if flat else samples[frame][index]
+                if voltage:
+                    # pylint:disable=protected-access
+                    raw_value = int(channels[index]._to_raw_value(sample) + 0.5)
+                else:
+                    raw_value = int(sample * 4095.0)
+                raw_value = min(max(raw_value, 0), 2**12 - 1)
+                buf[offset] = state[index * 2] & 0b00110000 | raw_value >> 8
+                buf[offset + 1] = raw_value & 0xFF
+                offset += 2
+        return buf
 
-        buf = bytearray(buffer_list)
+    def _pack_frames_numpy(self, samples: Sequence[Any], voltage: bool) -> bytearray:
+        try:
+            samples = np.asarray(samples, dtype=float)
+        except ValueError:
+            # rows of different lengths
+            raise AttributeError("each frame must contain one value per channel") from None
+        if samples.ndim == 1:
+            if samples.size % 4:
+                raise AttributeError("flat `samples` must contain four values per frame")
+            samples = samples.reshape(-1, 4)
+        elif samples.ndim != 2 or samples.shape[1] != 4:
+            raise AttributeError("each frame must contain one value per channel")
+        raw_values = np.empty(samples.shape)
+        for channel in self._channels:
+            # pylint:disable=protected-access
+            column = samples[:, channel.channel_index]
+            if not voltage:
+                raw_values[:, channel.channel_index] = np.floor(column * 4095.0)
+                continue
+            if channel._scale is None:
+                channel._update_scale()
+            table = channel._calibration_table
+            if table is None:
+                raw_value = column * channel._scale + channel._scale_offset
+            else:
+                starts, start_values, slopes = (np.array(field) for field in zip(*table))
+                segment = np.clip(np.searchsorted(starts, column, side="right") - 1, 0, None)
+                raw_value = start_values[segment] + (column - starts[segment]) * slopes[segment]
+            raw_values[:, channel.channel_index] = np.floor(raw_value + 0.5)
+
+        power_bits = np.array(self._power_bits())
+        frames = np.clip(raw_values, 0, 2**12 - 1).astype(np.uint16) | power_bits
+        return bytearray(frames.astype(">u2").tobytes())
+
+    def _pack_channel(self, buf: bytearray, offset: int, channel: "Channel") -> None:
+        # VREF PD1 PD0 Gx D11 D10 D9 D8 | D7 ... D0, moving the power-down bits over from
+        # where they sit in the Fast Write frame
+        state = self._state
+        high_byte = state[channel.channel_index * 2]
+        buf[offset] = (high_byte & 0b00110000) << 1 | high_byte & 0b00001111
+        buf[offset] |= channel.vref << 7
+        buf[offset] |= channel.gain << 4
+        buf[offset + 1] = state[channel.channel_index * 2 + 1]
 
+    def _general_call(self, byte_command: int) -> None:
+        buf = self._buffer
+        buf[0] = byte_command
+
+        # a general call goes to address 0x00 rather than the device's own address, so it
+        # is written straight to the bus while the device holds the lock
+        stats = self.stats
+        if stats is None:
+            with self.i2c_device as i2c:
+                i2c.i2c.writeto(_MCP4728_GENERAL_CALL_ADDRESS, buf, end=1)
+            return
+        began = monotonic()
         with self.i2c_device as i2c:
-            i2c.write(buf)
+            i2c.i2c.writeto(_MCP4728_GENERAL_CALL_ADDRESS, buf, end=1)
+        stats.record("general_call", 1, 0, monotonic() - began)
 
     def reset(self) -> None:
         """Internal Reset similar to a Power-on Reset (POR).
@@ -257,12 +1255,19 @@ class MCP4728:
         and output registers immediately"""
 
         self._general_call(_MCP4728_GENERAL_CALL_RESET_COMMAND)
+        # the registers now hold whatever was in the EEPROM, so read them again before the
+        # channels are next used
+        self._read_pending = True
 
     def wakeup(self) -> None:
         """Reset the Power-Down bits (PD1, PD0 = 0,0) and
         Resumes Normal Operation mode"""
 
         self._general_call(_MCP4728_GENERAL_CALL_WAKEUP_COMMAND)
+        for index in range(4):
+            self._store_power_down(index, PowerDown.NORMAL)
+        if self.recorder is not None:
+            self.recorder.record(self._state)
 
     def soft_update(self) -> None:
         """Updates all DAC analog outputs (VOUT) at the same time."""
@@ -272,11 +1277,27 @@ class MCP4728:
     # TODO : general_call read address
 
 
+class _Batch:
+    """Context manager returned by :meth:`MCP4728.batch` and
+    :meth:`adafruit_mcp4728_bank.MCP4728Bank.batch`"""
+
+    def __init__(self, target: Union[MCP4728, "MCP4728Bank"]) -> None:
+        self._target = target
+
+    def __enter__(self) -> Union[MCP4728, "MCP4728Bank"]:
+        self._target._begin_batch()  # pylint:disable=protected-access
+        return self._target
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+        # the channel caches already hold the new values, so send them even if the block
+        # raised to keep the DAC in step with the driver
+        self._target._end_batch()  # pylint:disable=protected-access
+
+
 class Channel:
     """An instance of a single channel for a multi-channel DAC.
 
     :param dac_instance: Instance of the channel object
-    :param cache_page: cache page of the channel
     :param index: Index of the channel
 
     .. note::
@@ -286,17 +1307,145 @@ class Channel:
 
     """
 
+    __slots__ = (
+        "_dac",
+        "_state",
+        "_offset",
+        "_bit",
+        "_scale",
+        "_scale_offset",
+        "_calibration_offset",
+        "_calibration_gain",
+        "_calibration_table",
+        "channel_index",
+    )
+
     def __init__(
         self,
-        dac_instance: Literal[0, 1, 2, 3],
-        cache_page: Dict[str, int],
-        index: int,
+        dac_instance: MCP4728,
+        index: Literal[0, 1, 2, 3],
     ) -> None:
-        self._vref = cache_page["vref"]
-        self._gain = cache_page["gain"]
-        self._raw_value = cache_page["value"]
         self._dac = dac_instance
+        # pylint:disable=protected-access
+        self._state = dac_instance._state
+        self._offset = index * 2
+        # channel A is the high bit of the vref and gain nibbles
+        self._bit = 3 - index
         self.channel_index = index
+        # raw value = voltage * _scale + _scale_offset, worked out again when needed after
+        # the vref, gain, vdd or calibration change
+        self._scale = None
+        self._scale_offset = 0.0
+        self._calibration_offset = 0.0
+        self._calibration_gain = 1.0
+        self._calibration_table = None
+
+    @property
+    def voltage(self) -> float:
+        """The channel's output voltage, worked out from the raw value, vref, gain, the DAC's
+        :attr:`MCP4728.vdd` and the channel's calibration. Setting it picks the nearest raw
+        value"""
+        return self._to_voltage(self.raw_value)
+
+    @voltage.setter
+    def voltage(self, value: float) -> None:
+        raw_value = self._to_raw_value(value)
+        # full scale is a code past the top one, so it is rounded down to the top code
+        if raw_value < -0.5 or raw_value > 2**12 + 0.5:
+            raise AttributeError(
+                f"`voltage` must be between {self._to_voltage(0):.4f} and "
+                f"{self._to_voltage(2**12):.4f}"
+            )
+        self.raw_value = min(max(int(raw_value + 0.5), 0), 2**12 - 1)
+
+    def _to_raw_value(self, voltage: float) -> float:
+        """Converts a voltage to an unrounded and unchecked raw value"""
+        if self._scale is None:
+            self._update_scale()
+        table = self._calibration_table
+        if table is None:
+            return voltage * self._scale + self._scale_offset
+
+        # table segments are (voltage, raw value, raw values per volt), and the first and
+        # last segments carry on past the ends of the table
+        segment = table[0]
+        for index in range(1, len(table)):
+            if voltage < table[index][0]:
+                break
+            segment = table[index]
+        return segment[1] + (voltage - segment[0]) * segment[2]
+
+    def _to_voltage(self, raw_value: int) -> float:
+        if self._scale is None:
+            self._update_scale()
+        table = self._calibration_table
+        if table is None:
+            return (raw_value - self._scale_offset) / self._scale
+
+        segment = table[0]
+        for index in range(1, len(table)):
+            if raw_value < table[index][1]:
+                break
+            segment = table[index]
+        return segment[0] + (raw_value - segment[1]) / segment[2]
+
+    def ramp_to(
+        self, target: int, duration: Optional[float] = None, slew_rate: Optional[float] = None
+    ) -> None:
+        """Moves the channel smoothly from its current raw value to ``target``, returning once
+        it gets there. See :meth:`MCP4728.ramp`
+
+        :param int target: The 12-bit raw value to ramp to
+        :param float duration: How long the ramp should take, in seconds
+        :param float slew_rate: How fast to change, in raw codes per second. Used to work out
+            the duration if that isn't given
+        """
+        targets = [None, None, None, None]
+        targets[self.channel_index] = target
+        self._dac.ramp(targets, duration, slew_rate)
+
+    def calibrate(
+        self,
+        offset: float = 0.0,
+        gain: float = 1.0,
+        table: Optional[Sequence[Tuple[float, int]]] = None,
+    ) -> None:
+        """Sets the calibration used to convert :attr:`voltage`.
+
+        :param float offset: The offset error of the output in volts, the voltage measured
+            when the output should be 0V. Defaults to :const:`0.0`
+        :param float gain: The gain error of the output, the measured voltage divided by the
+            voltage it should be once the offset is removed. Defaults to :const:`1.0`
+        :param table: Measured ``(voltage, raw_value)`` points to interpolate between instead,
+            in increasing order. At least two are needed. ``offset`` and ``gain`` are ignored,
+            and so are vref, gain and vdd since the points are measured with them in place
+        """
+        if gain <= 0:
+            raise AttributeError("`gain` must be greater than 0")
+        if table is not None:
+            if len(table) < 2:
+                raise AttributeError("`table` must contain at least two points")
+            segments = []
+            for (voltage, raw_value), (next_voltage, next_raw_value) in zip(table, table[1:]):
+                if next_voltage <= voltage or next_raw_value <= raw_value:
+                    raise AttributeError("`table` voltages and raw values must both increase")
+                segments.append(
+                    (voltage, raw_value, (next_raw_value - raw_value) / (next_voltage - voltage))
+                )
+            table = tuple(segments)
+        self._calibration_offset = offset
+        self._calibration_gain = gain
+        self._calibration_table = table
+        self._scale = None
+
+    def _update_scale(self) -> None:
+        if self.vref == Vref.VDD:
+            full_scale = self._dac.vdd
+        else:
+            full_scale = _MCP4728_INTERNAL_VREF * (self.gain + 1)
+        # Vout = full scale * raw value / 4096, then the calibration's gain and offset errors
+        self._scale = 2**12 / (full_scale * self._calibration_gain)
+        self._scale_offset = -self._calibration_offset * self._scale
 
     @property
     def normalized_value(self) -> float:
@@ -327,7 +1476,8 @@ class Channel:
     @property
     def raw_value(self) -> int:
         """The native 12-bit value used by the DAC"""
-        return self._raw_value
+        self._dac._load()  # pylint:disable=protected-access
+        return (self._state[self._offset] & 0b00001111) << 8 | self._state[self._offset + 1]
 
     @raw_value.setter
     def raw_value(self, value: int) -> None:
@@ -335,10 +1485,13 @@ class Channel:
             raise AttributeError(
                 f"`raw_value` must be a 12-bit integer between 0 and {(2**12 - 1)}"
             )
-        self._raw_value = value
         # disabling the protected access warning here because making it public would be
         # more confusing
-        self._dac._set_value(self)  # pylint:disable=protected-access
+        # pylint:disable=protected-access
+        if self._dac._redundant(self.raw_value, value):
+            return
+        self._dac._store_value(self.channel_index, value)
+        self._dac._set_value(self)
 
     @property
     def gain(self) -> Literal[1, 2]:
@@ -347,23 +1500,50 @@ class Channel:
 
         With gain set to 1, the output voltage goes from 0v to 2.048V. If a channel's gain is set
         to 2, the voltage goes from 0V to 4.096V. :attr:`gain` Must be 1 or 2"""
-        return self._gain
+        self._dac._load()  # pylint:disable=protected-access
+        return self._state[_GAIN_BITS] >> self._bit & 1
 
     @gain.setter
     def gain(self, value: Literal[1, 2]) -> None:
         if value not in {1, 2}:
             raise AttributeError("`gain` must be 1 or 2")
-        self._gain = value - 1
-        self._dac.sync_gains()
+        # pylint:disable=protected-access
+        if self._dac._redundant(self.gain, value - 1):
+            return
+        self._dac._store_bit(_GAIN_BITS, self.channel_index, value - 1)
+        self._dac._queue(1 << (_GAIN_FIELD + self.channel_index))
+
+    @property
+    def power_down(self) -> Literal[0, 1, 2, 3]:
+        """The channel's power-down mode. Must be a ``PowerDown``. While powered down the
+        output is disconnected and pulled to ground through the selected resistor. The mode is
+        kept when the channel's value changes; set it back to ``PowerDown.NORMAL`` to resume
+        output, or use :meth:`MCP4728.set_power_down` to change all four channels at once"""
+        self._dac._load()  # pylint:disable=protected-access
+        return self._state[self._offset] >> 4 & 0b11
+
+    @power_down.setter
+    def power_down(self, value: Literal[0, 1, 2, 3]) -> None:
+        if not PowerDown.is_valid(value):
+            raise AttributeError("power_down must be a `PowerDown`")
+        # pylint:disable=protected-access
+        if self._dac._redundant(self.power_down, value):
+            return
+        self._dac._store_power_down(self.channel_index, value)
+        self._dac._queue(1 << (_POWER_FIELD + self.channel_index))
 
     @property
     def vref(self) -> Literal[0, 1]:
         """Sets the DAC's voltage reference source. Must be a ``VREF``"""
-        return self._vref
+        self._dac._load()  # pylint:disable=protected-access
+        return self._state[_VREF_BITS] >> self._bit & 1
 
     @vref.setter
     def vref(self, value: Literal[0, 1]) -> None:
         if not Vref.is_valid(value):
             raise AttributeError("range must be a `Vref`")
-        self._vref = value
-        self._dac.sync_vrefs()
+        # pylint:disable=protected-access
+        if self._dac._redundant(self.vref, value):
+            return
+        self._dac._store_bit(_VREF_BITS, self.channel_index, value)
+        self._dac._queue(1 << (_VREF_FIELD + self.channel_index))
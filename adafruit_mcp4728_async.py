@@ -0,0 +1,162 @@
+# SPDX-FileCopyrightText: 2026 agent
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_mcp4728_async`
+================================================================================
+
+An asyncio interface to the Microchip MCP4728 DAC
+
+
+* Author(s): agent
+
+Implementation Notes
+--------------------
+
+Needs the ``asyncio`` library.
+"""
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MCP4728.git"
+
+import asyncio
+from time import monotonic
+
+import adafruit_mcp4728
+from adafruit_mcp4728 import MCP4728, MCP4728_DEFAULT_ADDRESS, Readback
+
+try:
+    from typing import Any, Callable, Optional, Sequence
+
+    from busio import I2C
+except ImportError:
+    pass
+
+
+def _executor_runner() -> Optional[Callable[..., Any]]:
+    """The running event loop's ``run_in_executor``, or `None` where there is none, as on
+    CircuitPython, which also has no ``get_running_loop``"""
+    get_running_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+    return getattr(get_running_loop(), "run_in_executor", None)
+
+
+class AsyncMCP4728:
+    """An :mod:`asyncio` interface to the Microchip MCP4728 I2C 12-bit Quad DAC.
+
+    Where the event loop can run functions in an executor, as on CPython, bus transfers are
+    made on a worker thread so they don't hold up other tasks. Waiting for the EEPROM to be
+    written is done with :func:`asyncio.sleep` everywhere.
+
+    Use :meth:`create` to make one, which reads the DAC's settings without blocking the loop.
+    Making one directly puts the read off until the first transfer or channel access.
+
+    :param ~busio.I2C i2c_bus: The I2C bus the MCP4728 is connected to.
+    :param int address: The I2C device address. Defaults to :const:`0x60`
+    :param bool auto_write: Whether channel changes are sent to the DAC immediately. With
+        the default of ``False``, changes made through the channels are only cached, without
+        blocking, and are sent by :meth:`flush`. If ``True``, setting a channel writes to the
+        bus from the calling thread, so it blocks the loop. Defaults to ``False``
+
+    .. warning::
+        The channels are not locked against the worker thread, which reads and clears the
+        pending changes while it writes. Whatever ``auto_write`` is, don't touch the channels
+        while a method of this object is being awaited, or the change may never be sent.
+
+    .. code-block:: python
+
+        mcp4728 = await adafruit_mcp4728_async.AsyncMCP4728.create(i2c)
+        await mcp4728.set_values((65535, 32767, 16383, 0))
+        mcp4728.channel_a.vref = adafruit_mcp4728.Vref.INTERNAL
+        await mcp4728.flush()
+        await mcp4728.save_settings()
+    """
+
+    def __init__(
+        self,
+        i2c_bus: I2C,
+        address: int = MCP4728_DEFAULT_ADDRESS,
+        auto_write: bool = False,
+    ) -> None:
+        self.device = MCP4728(i2c_bus, address, auto_write=auto_write, readback=Readback.LAZY)
+        """The underlying :class:`MCP4728`"""
+        self.channel_a = self.device.channel_a
+        self.channel_b = self.device.channel_b
+        self.channel_c = self.device.channel_c
+        self.channel_d = self.device.channel_d
+        # the device builds every command in one buffer, so only one transfer may be in
+        # progress at a time. The lock is made on first use to bind to the running loop
+        self._lock = None
+
+    @classmethod
+    async def create(
+        cls,
+        i2c_bus: I2C,
+        address: int = MCP4728_DEFAULT_ADDRESS,
+        auto_write: bool = False,
+    ) -> "AsyncMCP4728":
+        """Makes an ``AsyncMCP4728`` and reads the DAC's current settings, with the probe and
+        the read done off the event loop where possible. Takes the same parameters as the
+        class"""
+        run_in_executor = _executor_runner()
+        if run_in_executor is None:
+            mcp4728 = cls(i2c_bus, address, auto_write)
+        else:
+            mcp4728 = await run_in_executor(None, cls, i2c_bus, address, auto_write)
+        await mcp4728.read_registers()
+        return mcp4728
+
+    async def _run(self, function: Callable[..., Any], *args) -> Any:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            run_in_executor = _executor_runner()
+            if run_in_executor is None:
+                return function(*args)
+            return await run_in_executor(None, function, *args)
+
+    def _set_and_flush(
+        self, setter: Callable[[Sequence[int]], None], values: Sequence[int]
+    ) -> None:
+        setter(values)
+        # with auto_write off the setter only caches the values
+        self.device.flush()
+
+    async def set_raw_values(self, values: Sequence[int]) -> None:
+        """Sets the native 12-bit values of all four channels and writes them to the DAC,
+        along with any other pending changes, whatever :attr:`MCP4728.auto_write` is. See
+        :meth:`MCP4728.set_raw_values`"""
+        await self._run(self._set_and_flush, self.device.set_raw_values, values)
+
+    async def set_values(self, values: Sequence[int]) -> None:
+        """Sets the 16-bit scaled values of all four channels and writes them to the DAC,
+        along with any other pending changes, whatever :attr:`MCP4728.auto_write` is. See
+        :meth:`MCP4728.set_values`"""
+        await self._run(self._set_and_flush, self.device.set_values, values)
+
+    async def flush(self) -> None:
+        """Sends any channel changes that have not been written to the DAC yet. See
+        :meth:`MCP4728.flush`"""
+        await self._run(self.device.flush)
+
+    async def read_registers(self) -> None:
+        """Reads the current values, vref and gain of every channel back from the DAC"""
+        await self._run(self.device._read_registers)  # pylint:disable=protected-access
+
+    async def save_settings(self) -> None:
+        """Saves the currently selected values, Vref, and gain selections for each channel
+        to the EEPROM, setting them as defaults on power up. See
+        :meth:`MCP4728.save_settings`"""
+        # pylint:disable=protected-access
+        written = await self._run(self.device._write_multi_eeprom)
+        if not written:
+            return
+        deadline = monotonic() + adafruit_mcp4728._MCP4728_EEPROM_WRITE_TIMEOUT
+        while not await self._run(self.device._eeprom_ready):
+            if monotonic() > deadline:
+                raise RuntimeError("Timed out waiting for the EEPROM write to complete")
+            await asyncio.sleep(adafruit_mcp4728._MCP4728_EEPROM_POLL_INTERVAL)
+
+    async def soft_update(self) -> None:
+        """Updates all DAC analog outputs (VOUT) at the same time."""
+        await self._run(self.device.soft_update)
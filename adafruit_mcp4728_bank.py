@@ -0,0 +1,177 @@
+# SPDX-FileCopyrightText: 2026 agent
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_mcp4728_bank`
+================================================================================
+
+Updates the outputs of several Microchip MCP4728 DACs together
+
+
+* Author(s): agent
+
+Implementation Notes
+--------------------
+
+Parallel dispatch needs thread support, as on CPython with Blinka.
+"""
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MCP4728.git"
+
+from time import monotonic
+
+import adafruit_mcp4728
+from adafruit_mcp4728 import MCP4728, IOStats
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+try:
+    from typing import Callable, Iterable, Optional, Sequence, Tuple
+except ImportError:
+    pass
+
+
+class MCP4728Bank:
+    """A group of MCP4728s, on one or more I2C buses, whose outputs are updated together.
+
+    Changes to the channels of every device are written with the UDAC bit set, holding the
+    outputs at their old values, then a single :meth:`MCP4728.soft_update` general call per bus
+    updates the outputs of all the devices on it at the same time.
+
+    :param devices: The :class:`MCP4728` instances in the bank
+    :param bool parallel: Whether to write to each I2C bus from its own thread, so that
+        devices on separate buses are written at the same time. Needs thread support, as on
+        CPython with Blinka. Defaults to ``False``
+
+    .. code-block:: python
+
+        bank = adafruit_mcp4728_bank.MCP4728Bank(
+            (
+                adafruit_mcp4728.MCP4728(i2c, 0x60),
+                adafruit_mcp4728.MCP4728(i2c, 0x61),
+            )
+        )
+        with bank.batch():
+            bank[0].channel_a.value = 65535
+            bank[1].channel_d.value = 0
+
+    .. note::
+        Devices on different buses are updated by separate general calls, one bus after
+        another unless ``parallel`` is set.
+    """
+
+    def __init__(self, devices: Iterable[MCP4728], parallel: bool = False) -> None:
+        self.devices = tuple(devices)
+
+        buses = []
+        for device in self.devices:
+            for bus in buses:
+                if bus[0].i2c_device.i2c is device.i2c_device.i2c:
+                    bus.append(device)
+                    break
+            else:
+                buses.append([device])
+        self.buses = tuple(tuple(bus) for bus in buses)
+        """The devices of the bank grouped by the I2C bus they are on"""
+
+        self._executor = None
+        if parallel:
+            if ThreadPoolExecutor is None:
+                raise RuntimeError("parallel dispatch needs thread support")
+            self._executor = ThreadPoolExecutor(max_workers=len(self.buses))
+
+    def deinit(self) -> None:
+        """Stops the threads used for parallel dispatch"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __len__(self) -> int:
+        return len(self.devices)
+
+    def __getitem__(self, index: int) -> MCP4728:
+        return self.devices[index]
+
+    def batch(self) -> adafruit_mcp4728._Batch:
+        """Returns a context manager that holds back channel changes on every device in the
+        bank until it exits, then updates all of their outputs together. See
+        :meth:`MCP4728.batch`"""
+        return adafruit_mcp4728._Batch(self)  # pylint:disable=protected-access
+
+    def enable_stats(
+        self, callback: Optional[Callable[[str, int, int, float], None]] = None
+    ) -> None:
+        """Starts counting the I2C transfers of every device in the bank. See
+        :meth:`MCP4728.enable_stats`
+
+        :param callback: A function called after every transfer. See :class:`IOStats`
+        """
+        for device in self.devices:
+            device.enable_stats(callback)
+
+    def disable_stats(self) -> None:
+        """Stops counting the I2C transfers of every device in the bank"""
+        for device in self.devices:
+            device.disable_stats()
+
+    @property
+    def stats(self) -> IOStats:
+        """The counts of every device in the bank with stats enabled, added together"""
+        total = IOStats()
+        for device in self.devices:
+            if device.stats is not None:
+                total.merge(device.stats)
+        return total
+
+    def _begin_batch(self) -> None:
+        for device in self.devices:
+            device._begin_batch()  # pylint:disable=protected-access
+
+    def _end_batch(self) -> None:
+        for device in self.devices:
+            device._batch_depth -= 1  # pylint:disable=protected-access
+        self.flush()
+
+    def set_raw_values(self, values: Sequence[Sequence[int]]) -> None:
+        """Sets the native 12-bit values of all four channels of each device, then updates
+        all of the outputs together.
+
+        :param values: One sequence of four 12-bit values, in channel order A to D, for each
+            device in the bank
+        """
+        if len(values) != len(self.devices):
+            raise AttributeError("`values` must contain one sequence of values for each device")
+        with self.batch():
+            for device, device_values in zip(self.devices, values):
+                device.set_raw_values(device_values)
+
+    def flush(self) -> Tuple[float, ...]:
+        """Writes the pending channel changes of every device with the UDAC bit set, then
+        sends one software update general call on each bus that was written to.
+
+        Returns the time in seconds spent on each bus, in the order of :attr:`buses`"""
+        if self._executor is None or len(self.buses) < 2:
+            return tuple(self._flush_bus(bus) for bus in self.buses)
+
+        futures = [self._executor.submit(self._flush_bus, bus) for bus in self.buses]
+        return tuple(future.result() for future in futures)
+
+    @staticmethod
+    def _flush_bus(devices: Tuple[MCP4728, ...]) -> float:
+        # pylint:disable=protected-access
+        start = monotonic()
+        latch = None
+        for device in devices:
+            if device._batch_depth or not device._pending:
+                continue
+            device._flush(udac=1)
+            latch = device
+
+        if latch is not None:
+            latch.soft_update()
+        return monotonic() - start
@@ -0,0 +1,150 @@
+# SPDX-FileCopyrightText: 2026 agent
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_mcp4728_scheduler`
+================================================================================
+
+Plays samples through a Microchip MCP4728 DAC at a fixed rate
+
+
+* Author(s): agent
+
+Implementation Notes
+--------------------
+
+Deadlines are measured with :func:`time.monotonic`, so its resolution limits the sample
+rates that can be held.
+"""
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MCP4728.git"
+
+from array import array
+from time import monotonic, sleep
+
+from adafruit_mcp4728 import MCP4728
+
+try:
+    from typing import Sequence, Union
+
+    from circuitpython_typing import ReadableBuffer
+except ImportError:
+    pass
+
+
+class SampleScheduler:
+    """Plays four channel samples through an :class:`MCP4728` at a fixed sample rate.
+
+    Each sample is due at a deadline measured with :func:`time.monotonic` from the start of
+    playback. When playback falls behind, every sample that is already due is sent in one
+    I2C write, up to ``max_batch`` at a time, to catch up. With ``drop_late`` set only the
+    newest of them is sent instead. The timing of each :meth:`play` is summarized in
+    :attr:`played`, :attr:`late`, :attr:`dropped`, :attr:`achieved_rate` and :meth:`jitter`.
+
+    :param MCP4728 dac: The DAC to play the samples through
+    :param float rate: The sample rate in samples per second
+    :param int max_batch: The most samples to send in one I2C write when catching up.
+        Defaults to :const:`32`
+    :param bool drop_late: Whether to skip samples that are overdue instead of sending them
+        late. Defaults to ``False``
+
+    .. code-block:: python
+
+        scheduler = adafruit_mcp4728_scheduler.SampleScheduler(mcp4728, 1000)
+        scheduler.play(mcp4728.pack_frames(samples))
+        print(scheduler.achieved_rate, scheduler.late, scheduler.jitter(99))
+    """
+
+    def __init__(
+        self, dac: MCP4728, rate: float, max_batch: int = 32, drop_late: bool = False
+    ) -> None:
+        if rate <= 0:
+            raise AttributeError("`rate` must be greater than 0")
+        if max_batch < 1:
+            raise AttributeError("`max_batch` must be at least 1")
+        self.dac = dac
+        self.rate = rate
+        self.max_batch = max_batch
+        self.drop_late = drop_late
+
+        self.played = 0
+        """The number of samples sent by the last :meth:`play`"""
+        self.late = 0
+        """The number of samples sent more than one sample period after their deadline"""
+        self.dropped = 0
+        """The number of overdue samples skipped because of ``drop_late``"""
+        self.achieved_rate = 0.0
+        """The average rate, in samples per second, that samples were sent at between the
+        first and the last"""
+        # how late, in seconds, each write was made after the deadline of its first sample
+        self._lateness = array("f")
+
+    def play(self, frames: Union[Sequence[Sequence[int]], ReadableBuffer]) -> None:
+        """Plays the samples, returning once the last one has been sent.
+
+        :param frames: Either a sequence of 12-bit ``(a, b, c, d)`` samples, a buffer of
+            12-bit integer samples as taken by :meth:`MCP4728.stream`, or a bytes-like object
+            of packed Fast Write frames such as from :meth:`MCP4728.pack_frames`
+        """
+        # pylint:disable=protected-access
+        packed, frames = self.dac._split_frames(frames)
+        if packed is None:
+            # everything is packed before playback starts to keep it out of the timed loop
+            packed = bytearray(len(frames) * 8)
+            power_bits = self.dac._power_bits()
+            for index, frame in enumerate(frames):
+                self.dac._pack_raw_frame(packed, index * 8, frame, power_bits)
+            packed = memoryview(packed)
+
+        count = len(packed) // 8
+        period = 1 / self.rate
+        self.played = self.late = self.dropped = 0
+        self._lateness = array("f")
+
+        start = monotonic()
+        index = 0
+        while index < count:
+            deadline = start + index * period
+            now = monotonic()
+            if now < deadline:
+                sleep(deadline - now)
+                now = monotonic()
+
+            # every sample whose deadline has passed is due now. Rounding can put the time
+            # just short of a deadline that has been slept to, so at least one is
+            due = min(max(int((now - start) / period) + 1 - index, 1), count - index)
+            if self.drop_late and due > 1:
+                self.dropped += due - 1
+                index += due - 1
+                deadline = start + index * period
+                due = 1
+            due = min(due, self.max_batch)
+
+            self.dac.stream(packed[index * 8 : (index + due) * 8], chunk_size=due)
+            lateness = now - deadline
+            self._lateness.append(lateness)
+            # the samples after the first in a write were due a period apart
+            for sample in range(due):
+                if lateness - sample * period > period:
+                    self.late += 1
+            self.played += due
+            index += due
+
+        # the time from the first sample to the last spans one period fewer than the samples
+        elapsed = monotonic() - start
+        self.achieved_rate = (self.played - 1) / elapsed if self.played > 1 and elapsed > 0 else 0.0
+
+    def jitter(self, percentile: float = 50) -> float:
+        """Returns how late, in seconds, the writes of the last :meth:`play` were made
+        compared to their deadlines, at the given percentile.
+
+        :param float percentile: The percentile, from 0 to 100. Defaults to :const:`50`
+        """
+        if percentile < 0 or percentile > 100:
+            raise AttributeError("`percentile` must be between 0 and 100")
+        if not self._lateness:
+            return 0.0
+        lateness = sorted(self._lateness)
+        return lateness[int(percentile / 100 * (len(lateness) - 1) + 0.5)]
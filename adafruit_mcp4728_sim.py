@@ -0,0 +1,437 @@
+# SPDX-FileCopyrightText: 2026 agent
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_mcp4728_sim`
+================================================================================
+
+A software model of the I2C bus and the Microchip MCP4728, for exercising the
+`adafruit_mcp4728` driver without hardware
+
+
+* Author(s): agent
+
+Implementation Notes
+--------------------
+
+:class:`SimulatedI2C` stands in for ``busio.I2C``, and :class:`SimulatedMCP4728` decodes the
+commands written to it the way the DAC does, so the driver can be used unchanged:
+
+.. code-block:: python
+
+    import adafruit_mcp4728
+    from adafruit_mcp4728_sim import SimulatedI2C, SimulatedMCP4728
+
+    i2c = SimulatedI2C(frequency=400_000)
+    dac = SimulatedMCP4728(i2c)
+    mcp4728 = adafruit_mcp4728.MCP4728(i2c)
+    mcp4728.channel_a.raw_value = 1000
+    print(dac.outputs, i2c.transactions, i2c.elapsed)
+
+The bus adds up the time each transaction would take on the wire at its clock rate, without
+the clock stretching or the high speed mode master code of a real bus.
+"""
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MCP4728.git"
+
+from time import monotonic, sleep
+
+try:
+    from typing import Dict, List, Optional, Tuple
+
+    from circuitpython_typing import ReadableBuffer, WriteableBuffer
+except ImportError:
+    pass
+
+_GENERAL_CALL_ADDRESS = 0x00
+
+_GENERAL_CALL_RESET = 0x06
+
+_GENERAL_CALL_SOFTWARE_UPDATE = 0x08
+
+_GENERAL_CALL_WAKEUP = 0x09
+
+_INTERNAL_VREF = 2.048
+
+# each byte is eight data bits and an ack, and each transaction adds a start and a stop
+_BITS_PER_BYTE = 9
+
+_START_STOP_BITS = 2
+
+_EIO = 5
+
+_ENODEV = 19
+
+# register words are kept in the layout of the second and third bytes of a Multi-Write:
+# VREF PD1 PD0 GX D11-D0
+_VREF_BIT = 0x8000
+
+_POWER_DOWN_SHIFT = 13
+
+_GAIN_BIT = 0x1000
+
+_VALUE_MASK = 0x0FFF
+
+
+class SimulatedI2C:
+    """A stand-in for ``busio.I2C`` that passes transactions to simulated devices and counts
+    the traffic and the time it would take at the given clock rate.
+
+    :param int frequency: The bus clock rate in Hz. Defaults to :const:`400000`
+    :param bool realtime: Whether to sleep for the modeled time of each transaction, so that
+        the bus runs no faster than real hardware. Defaults to `False`
+    """
+
+    def __init__(self, frequency: int = 400000, realtime: bool = False) -> None:
+        self.frequency = frequency
+        self.realtime = realtime
+        self.devices = {}  # type: Dict[int, SimulatedMCP4728]
+        self.transactions = 0
+        """The number of transactions on the bus, including general calls"""
+        self.bytes_written = 0
+        """The number of data bytes written, not counting address bytes"""
+        self.bytes_read = 0
+        """The number of data bytes read, not counting address bytes"""
+        self.elapsed = 0.0
+        """The modeled time spent on the wire in seconds"""
+        self._locked = False
+
+    def attach(self, device: "SimulatedMCP4728") -> None:
+        """Adds a simulated device to the bus at its address
+
+        :param device: The device to add
+        """
+        if device.address in self.devices:
+            raise ValueError(f"Address 0x{device.address:02x} is already in use")
+        self.devices[device.address] = device
+
+    def reset_stats(self) -> None:
+        """Zeroes the transaction, byte and time counters"""
+        self.transactions = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.elapsed = 0.0
+
+    def transaction_time(self, length: int) -> float:
+        """The time one transaction with the given number of data bytes takes on the wire at
+        the bus clock rate, in seconds
+
+        :param int length: The number of data bytes after the address byte
+        """
+        return ((length + 1) * _BITS_PER_BYTE + _START_STOP_BITS) / self.frequency
+
+    def try_lock(self) -> bool:
+        """Locks the bus for the caller, returning whether the lock was taken"""
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self) -> None:
+        """Releases the bus lock"""
+        self._locked = False
+
+    def deinit(self) -> None:
+        """Releases the bus. Kept for compatibility with ``busio.I2C``"""
+        self._locked = False
+
+    def __enter__(self) -> "SimulatedI2C":
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+        self.deinit()
+
+    def scan(self) -> List[int]:
+        """The addresses of the attached devices"""
+        return sorted(self.devices)
+
+    def writeto(
+        self, address: int, buffer: ReadableBuffer, *, start: int = 0, end: Optional[int] = None
+    ) -> None:
+        """Writes ``buffer[start:end]`` to the device at ``address``. Address 0 is the general
+        call address, which every device receives.
+
+        :param int address: The 7-bit device address
+        :param buffer: The bytes to write
+        :param int start: The index of the first byte to write
+        :param int end: The index after the last byte to write. Defaults to the buffer length
+        """
+        if end is None:
+            end = len(buffer)
+        data = bytes(buffer[start:end])
+        self._account(len(data))
+        self.bytes_written += len(data)
+        if address == _GENERAL_CALL_ADDRESS:
+            for device in self.devices.values():
+                device.general_call(data)
+            return
+        self._device(address).write(data)
+
+    def readfrom_into(
+        self, address: int, buffer: WriteableBuffer, *, start: int = 0, end: Optional[int] = None
+    ) -> None:
+        """Reads ``end - start`` bytes from the device at ``address`` into ``buffer[start:end]``
+
+        :param int address: The 7-bit device address
+        :param buffer: The buffer to read into
+        :param int start: The index of the first byte to fill
+        :param int end: The index after the last byte to fill. Defaults to the buffer length
+        """
+        if end is None:
+            end = len(buffer)
+        self._account(end - start)
+        self.bytes_read += end - start
+        buffer[start:end] = self._device(address).read(end - start)
+
+    def writeto_then_readfrom(
+        self,
+        address: int,
+        buffer_out: ReadableBuffer,
+        buffer_in: WriteableBuffer,
+        *,
+        out_start: int = 0,
+        out_end: Optional[int] = None,
+        in_start: int = 0,
+        in_end: Optional[int] = None,
+    ) -> None:
+        """Writes to the device at ``address`` and reads back from it. The MCP4728 driver does
+        not use combined transactions, so this is modeled as a write and a read.
+        """
+        self.writeto(address, buffer_out, start=out_start, end=out_end)
+        self.readfrom_into(address, buffer_in, start=in_start, end=in_end)
+
+    def _device(self, address: int) -> "SimulatedMCP4728":
+        try:
+            return self.devices[address]
+        except KeyError:
+            raise OSError(_ENODEV, f"No I2C device at address: 0x{address:x}") from None
+
+    def _account(self, length: int) -> None:
+        duration = self.transaction_time(length)
+        self.transactions += 1
+        self.elapsed += duration
+        if self.realtime:
+            sleep(duration)
+
+
+class SimulatedMCP4728:
+    """A model of the MCP4728 that decodes Fast Write, Multi-Write, Sequential Write, Single
+    Write, the vref, gain and power-down select commands and general calls. It keeps the
+    input registers, the output registers and the EEPROM of each channel and serves the
+    24-byte readback.
+
+    Fast Writes update the outputs right away. Multi-Write, Sequential Write and Single Write
+    only update the outputs when their UDAC bit is clear, or when :attr:`ldac` is low. The
+    select commands update the input and output registers at once. Commands that program the
+    EEPROM leave the device busy for ``eeprom_write_time`` seconds, during which it does not
+    acknowledge writes.
+
+    :param SimulatedI2C i2c_bus: The bus to attach to, if any
+    :param int address: The 7-bit I2C address. Defaults to :const:`0x60`
+    :param eeprom: The initial EEPROM words, in the ``VREF PD1 PD0 GX D11-D0`` layout of a
+        Multi-Write. Defaults to all zeros, the factory setting
+    :param float vdd: The supply voltage, used by :meth:`voltage`. Defaults to :const:`3.3`
+    :param float eeprom_write_time: How long an EEPROM write keeps the device busy, in seconds.
+        Defaults to :const:`0.025`, the typical time from the datasheet
+    """
+
+    def __init__(
+        self,
+        i2c_bus: Optional[SimulatedI2C] = None,
+        address: int = 0x60,
+        eeprom: Optional[List[int]] = None,
+        vdd: float = 3.3,
+        eeprom_write_time: float = 0.025,
+    ) -> None:
+        self.address = address
+        self.vdd = vdd
+        self.eeprom_write_time = eeprom_write_time
+        self.eeprom = list(eeprom) if eeprom is not None else [0, 0, 0, 0]
+        """The EEPROM word of each channel"""
+        self.inputs = list(self.eeprom)
+        """The input register word of each channel"""
+        self.outputs = list(self.eeprom)
+        """The output register word of each channel, which sets the output voltage"""
+        self.ldac = True
+        """The level of the LDAC pin. While it is low, the outputs follow the input registers"""
+        self.commands = {}  # type: Dict[str, int]
+        """The number of each kind of command decoded, keyed by command name"""
+        self._busy_until = 0.0
+        if i2c_bus is not None:
+            i2c_bus.attach(self)
+
+    @property
+    def busy(self) -> bool:
+        """Whether an EEPROM write is in progress"""
+        return monotonic() < self._busy_until
+
+    @property
+    def values(self) -> Tuple[int, int, int, int]:
+        """The 12-bit output value of each channel"""
+        return tuple(word & _VALUE_MASK for word in self.outputs)
+
+    def voltage(self, index: int) -> float:
+        """The voltage on a channel's output, from its output register
+
+        :param int index: The channel index, from 0 for channel A to 3 for channel D
+        """
+        word = self.outputs[index]
+        if word >> _POWER_DOWN_SHIFT & 0b11:
+            return 0.0
+        if word & _VREF_BIT:
+            full_scale = _INTERNAL_VREF * (2 if word & _GAIN_BIT else 1)
+        else:
+            full_scale = self.vdd
+        return min((word & _VALUE_MASK) / 4096 * full_scale, self.vdd)
+
+    def set_ldac(self, level: bool) -> None:
+        """Drives the LDAC pin. Pulling it low copies every input register to its output.
+
+        :param bool level: The new pin level
+        """
+        self.ldac = level
+        if not level:
+            self.outputs[:] = self.inputs
+
+    def write(self, data: bytes) -> None:
+        """Decodes the bytes of one write transaction addressed to the device
+
+        :param bytes data: The bytes after the address byte
+        """
+        if not data:
+            # an empty write is a probe, which the device acknowledges
+            return
+        if self.busy:
+            raise OSError(_EIO, "MCP4728 is busy writing its EEPROM")
+        command = data[0]
+        if command & 0b11000000 == 0:
+            self._fast_write(data)
+        elif command & 0b11111000 == 0b01000000:
+            self._multi_write(data)
+        elif command & 0b11111000 == 0b01010000:
+            self._sequential_write(data)
+        elif command & 0b11111000 == 0b01011000:
+            self._single_write(data)
+        elif command & 0b11100000 == 0b10000000:
+            self._select(data, "select_vref", _VREF_BIT)
+        elif command & 0b11100000 == 0b11000000:
+            self._select(data, "select_gain", _GAIN_BIT)
+        elif command & 0b11100000 == 0b10100000:
+            self._select_power_down(data)
+        else:
+            raise OSError(_EIO, f"Unsupported MCP4728 command: 0x{command:02x}")
+
+    def read(self, length: int) -> bytes:
+        """The bytes the device sends for a read transaction: for each channel, a header and
+        the input register, then a header and the EEPROM word
+
+        :param int length: The number of bytes to read
+        """
+        ready = 0 if self.busy else 0b10000000
+        address_bits = self.address & 0b111
+        image = bytearray()
+        for index in range(4):
+            # RDY/BSY POR DAC1 DAC0 EEPROM A2 A1 A0, with POR set once powered up
+            header = ready | 0b01000000 | index << 4 | address_bits
+            image += bytes((header, self.inputs[index] >> 8, self.inputs[index] & 0xFF))
+            image += bytes((header | 0b1000, self.eeprom[index] >> 8, self.eeprom[index] & 0xFF))
+        # the device starts the readback over after the last channel
+        return bytes(image[i % len(image)] for i in range(length))
+
+    def general_call(self, data: bytes) -> None:
+        """Handles a general call, which every device on the bus receives
+
+        :param bytes data: The bytes written to address 0
+        """
+        if not data:
+            return
+        command = data[0]
+        if command == _GENERAL_CALL_RESET:
+            self._count("general_call_reset")
+            self.inputs[:] = self.eeprom
+            self.outputs[:] = self.eeprom
+        elif command == _GENERAL_CALL_WAKEUP:
+            self._count("general_call_wakeup")
+            power_down = 0b11 << _POWER_DOWN_SHIFT
+            for registers in (self.inputs, self.outputs):
+                for index in range(4):
+                    registers[index] &= ~power_down
+        elif command == _GENERAL_CALL_SOFTWARE_UPDATE:
+            self._count("general_call_software_update")
+            self.outputs[:] = self.inputs
+
+    def _count(self, name: str) -> None:
+        self.commands[name] = self.commands.get(name, 0) + 1
+
+    def _update(self, index: int, word: int, udac: int) -> None:
+        self.inputs[index] = word
+        if not udac or not self.ldac:
+            self.outputs[index] = word
+
+    def _fast_write(self, data: bytes) -> None:
+        # 0 0 PD1 PD0 D11-D8, D7-D0 for channels A to D, which may repeat in one transaction
+        self._count("fast_write")
+        for offset in range(0, len(data) - 1, 2):
+            index = offset // 2 % 4
+            high = data[offset]
+            word = self.inputs[index] & (_VREF_BIT | _GAIN_BIT)
+            word |= (high & 0b00110000) << 9 | (high & 0x0F) << 8 | data[offset + 1]
+            self._update(index, word, 0)
+
+    def _multi_write(self, data: bytes) -> None:
+        # 0 1 0 0 0 DAC1 DAC0 UDAC, VREF PD1 PD0 GX D11-D8, D7-D0, for each channel written
+        self._count("multi_write")
+        for offset in range(0, len(data) - 2, 3):
+            command = data[offset]
+            if command & 0b11111000 != 0b01000000:
+                raise OSError(_EIO, "Malformed Multi-Write")
+            word = data[offset + 1] << 8 | data[offset + 2]
+            self._update(command >> 1 & 0b11, word, command & 1)
+
+    def _sequential_write(self, data: bytes) -> None:
+        # 0 1 0 1 0 DAC1 DAC0 UDAC, then a word for each channel from DAC1 DAC0 through D
+        self._count("sequential_write")
+        first = data[0] >> 1 & 0b11
+        udac = data[0] & 1
+        for index in range(first, min(4, first + (len(data) - 1) // 2)):
+            offset = 1 + (index - first) * 2
+            word = data[offset] << 8 | data[offset + 1]
+            self._update(index, word, udac)
+            self.eeprom[index] = word
+        self._busy_until = monotonic() + self.eeprom_write_time
+
+    def _single_write(self, data: bytes) -> None:
+        # 0 1 0 1 1 DAC1 DAC0 UDAC, VREF PD1 PD0 GX D11-D8, D7-D0
+        self._count("single_write")
+        if len(data) < 3:
+            raise OSError(_EIO, "Malformed Single Write")
+        index = data[0] >> 1 & 0b11
+        word = data[1] << 8 | data[2]
+        self._update(index, word, data[0] & 1)
+        self.eeprom[index] = word
+        self._busy_until = monotonic() + self.eeprom_write_time
+
+    def _select(self, data: bytes, name: str, bit: int) -> None:
+        # 1 0 0 X VA VB VC VD or 1 1 0 X GA GB GC GD, with channel A in bit 3
+        self._count(name)
+        for index in range(4):
+            for registers in (self.inputs, self.outputs):
+                if data[0] & 0b1000 >> index:
+                    registers[index] |= bit
+                else:
+                    registers[index] &= ~bit
+
+    def _select_power_down(self, data: bytes) -> None:
+        # 1 0 1 X PD1A PD0A PD1B PD0B, PD1C PD0C PD1D PD0D X X X X
+        self._count("select_power_down")
+        if len(data) < 2:
+            raise OSError(_EIO, "Malformed Power-Down Select")
+        modes = (data[0] << 8 | data[1]) >> 4 & 0xFF
+        for index in range(4):
+            mode = modes >> (6 - index * 2) & 0b11
+            for registers in (self.inputs, self.outputs):
+                registers[index] = (
+                    registers[index] & ~(0b11 << _POWER_DOWN_SHIFT) | mode << _POWER_DOWN_SHIFT
+                )
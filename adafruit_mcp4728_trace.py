@@ -0,0 +1,208 @@
+# SPDX-FileCopyrightText: 2026 agent
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_mcp4728_trace`
+================================================================================
+
+Records the output of a Microchip MCP4728 DAC and plays it back
+
+
+* Author(s): agent
+
+Implementation Notes
+--------------------
+
+Traces are saved in a little endian binary format of a header and 12-byte records.
+"""
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MCP4728.git"
+
+from struct import pack_into, unpack_from
+from time import monotonic, sleep
+
+from adafruit_bus_device import i2c_device
+
+from adafruit_mcp4728 import MCP4728
+
+try:
+    from typing import Any, Optional, Union
+
+    from circuitpython_typing import ReadableBuffer
+except ImportError:
+    pass
+
+
+# a saved trace is this header, the magic and the record count, followed by the records
+_TRACE_MAGIC = b"MCPT"
+_TRACE_HEADER = "<4sI"
+_TRACE_HEADER_SIZE = 8
+
+# each trace record is the microseconds since the record before it as a little endian
+# 32-bit integer, followed by an 8-byte Fast Write frame
+_TRACE_RECORD_SIZE = 12
+
+
+class TraceRecorder:
+    """Records the frames written to an :class:`MCP4728` with their timings, in a ring buffer
+    that keeps the most recent ``capacity`` frames. Each frame is the 8-byte Fast Write frame
+    of the four channels' values and power-down modes after a write; vref and gain are not
+    recorded. Recording takes 12 bytes per frame in a buffer made up front. Apart from the
+    timestamp read from :func:`time.monotonic` on each write, recording allocates nothing.
+
+    :param int capacity: The number of frames to keep. Defaults to :const:`4096`
+
+    .. code-block:: python
+
+        mcp4728.recorder = adafruit_mcp4728_trace.TraceRecorder()
+        run_test()
+        with open("trace.bin", "wb") as file:
+            mcp4728.recorder.save(file)
+
+        with open("trace.bin", "rb") as file:
+            adafruit_mcp4728_trace.replay(mcp4728, file.read())
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        if capacity < 1:
+            raise AttributeError("`capacity` must be at least 1")
+        self.capacity = capacity
+        self.overwritten = 0
+        """The number of frames dropped to make room for newer ones"""
+        self._records = bytearray(capacity * _TRACE_RECORD_SIZE)
+        self._next = 0
+        self._count = 0
+        self._last = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, frames: ReadableBuffer, start: int = 0, end: int = 8) -> None:
+        """Records the 8-byte frames in ``frames[start:end]`` as written now
+
+        :param frames: The buffer holding the frames
+        :param int start: The index of the first frame's first byte. Defaults to :const:`0`
+        :param int end: The index after the last frame's last byte. Defaults to :const:`8`
+        """
+        now = monotonic()
+        delay = 0 if self._last is None else min(int((now - self._last) * 1000000), 0xFFFFFFFF)
+        self._last = now
+        records = self._records
+        for offset in range(start, end, 8):
+            position = self._next * _TRACE_RECORD_SIZE
+            pack_into("<I", records, position, delay)
+            # copied a byte at a time, as slicing would allocate
+            for index in range(8):
+                records[position + 4 + index] = frames[offset + index]
+            # frames written together are recorded as written at the same time
+            delay = 0
+            self._next = (self._next + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+            else:
+                self.overwritten += 1
+
+    def clear(self) -> None:
+        """Discards every recorded frame"""
+        self._next = 0
+        self._count = 0
+        self._last = None
+        self.overwritten = 0
+
+    def to_bytes(self) -> bytes:
+        """The recorded frames, oldest first, in the format read by :func:`replay`"""
+        header = bytearray(_TRACE_HEADER_SIZE)
+        pack_into(_TRACE_HEADER, header, 0, _TRACE_MAGIC, self._count)
+        records = self._records
+        if self._count < self.capacity:
+            return bytes(header) + records[: self._count * _TRACE_RECORD_SIZE]
+        split = self._next * _TRACE_RECORD_SIZE
+        return bytes(header) + records[split:] + records[:split]
+
+    def save(self, file: Any) -> None:
+        """Writes the recorded frames to a file opened for binary writing
+
+        :param file: The file to write to
+        """
+        file.write(self.to_bytes())
+
+
+def replay(
+    dac: MCP4728,
+    trace: Union["TraceRecorder", ReadableBuffer],
+    speed: Optional[float] = 1.0,
+    chunk_size: int = 32,
+) -> None:
+    """Plays back a recorded trace of Fast Write frames on a DAC, holding the bus for the
+    whole trace. Frames recorded as written together, and every frame when ``speed`` is `None`,
+    are gathered into one I2C write of up to ``chunk_size`` frames, which copies them into
+    a chunk buffer. A frame on its own is written straight from the trace.
+
+    :param MCP4728 dac: The DAC to play the trace on
+    :param trace: A :class:`TraceRecorder`, or a trace saved by :meth:`TraceRecorder.save`
+        as a bytes-like object such as an ``mmap``
+    :param float speed: How much faster than recorded to play the trace, or `None` to
+        ignore the timing and play it as fast as the bus allows. Defaults to :const:`1.0`
+    :param int chunk_size: The most frames in each I2C write. Defaults to :const:`32`
+    """
+    if isinstance(trace, TraceRecorder):
+        trace = trace.to_bytes()
+    view = memoryview(trace)
+    if len(view) < _TRACE_HEADER_SIZE:
+        raise AttributeError("`trace` is not an MCP4728 trace")
+    magic, count = unpack_from(_TRACE_HEADER, view, 0)
+    if magic != _TRACE_MAGIC:
+        raise AttributeError("`trace` is not an MCP4728 trace")
+    end = _TRACE_HEADER_SIZE + count * _TRACE_RECORD_SIZE
+    if len(view) < end:
+        raise AttributeError("`trace` is shorter than its record count")
+    if speed is not None and speed <= 0:
+        raise AttributeError("`speed` must be greater than 0")
+    if chunk_size < 1:
+        raise AttributeError("`chunk_size` must be at least 1")
+    if not count:
+        return
+    dac._load()  # pylint:disable=protected-access
+
+    buf = bytearray(chunk_size * 8)
+    chunk_bytes = chunk_size * _TRACE_RECORD_SIZE
+    with dac.i2c_device as i2c:
+        if speed is None:
+            for position in range(_TRACE_HEADER_SIZE, end, chunk_bytes):
+                _write_records(i2c, view, buf, position, min(position + chunk_bytes, end))
+        else:
+            start = monotonic()
+            due = 0.0
+            position = _TRACE_HEADER_SIZE
+            while position < end:
+                # the first record's delay is from a frame that isn't in the trace
+                if position > _TRACE_HEADER_SIZE:
+                    due += unpack_from("<I", view, position)[0] / 1000000 / speed
+                wait = start + due - monotonic()
+                if wait > 0:
+                    sleep(wait)
+                # the records after this one with no delay were written along with it
+                run_end = position + _TRACE_RECORD_SIZE
+                limit = min(position + chunk_bytes, end)
+                while run_end < limit and not unpack_from("<I", view, run_end)[0]:
+                    run_end += _TRACE_RECORD_SIZE
+                _write_records(i2c, view, buf, position, run_end)
+                position = run_end
+
+    dac._state[0:8] = view[end - 8 : end]  # pylint:disable=protected-access
+
+
+def _write_records(
+    i2c: i2c_device.I2CDevice, view: memoryview, buf: bytearray, start: int, end: int
+) -> None:
+    """Writes the frames of the trace records in ``view[start:end]`` in one I2C write"""
+    if end - start == _TRACE_RECORD_SIZE:
+        i2c.write(view, start=start + 4, end=end)
+        return
+    offset = 0
+    for position in range(start + 4, end, _TRACE_RECORD_SIZE):
+        buf[offset : offset + 8] = view[position : position + 8]
+        offset += 8
+    i2c.write(buf, end=offset)
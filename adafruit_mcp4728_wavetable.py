@@ -0,0 +1,293 @@
+# SPDX-FileCopyrightText: 2026 agent
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_mcp4728_wavetable`
+================================================================================
+
+Wavetable signal generation for the Microchip MCP4728 DAC
+
+
+* Author(s): agent
+
+Implementation Notes
+--------------------
+
+Frames are made with NumPy if it is installed.
+"""
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MCP4728.git"
+
+from array import array
+from math import pi, sin
+
+from adafruit_mcp4728 import CV, MCP4728, Channel
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from typing import Optional, Sequence, Tuple, Union
+except ImportError:
+    pass
+
+
+class Waveform(CV):
+    """Options for ``waveform``"""
+
+
+Waveform.add_values(
+    (
+        ("SINE", 0, "Sine", None),
+        ("TRIANGLE", 1, "Triangle", None),
+        ("SAW", 2, "Rising sawtooth", None),
+    )
+)
+
+
+class Oscillator:
+    """Generates periodic signals on the channels of an :class:`MCP4728` from precomputed
+    wavetables.
+
+    Each channel plays one period of its waveform, already converted to 12-bit Fast Write
+    words, from a table of ``table_size`` entries. A 32-bit fixed point phase accumulator
+    per channel steps through the table at the channel's frequency, so making a sample only
+    takes a table lookup per channel, or one array operation per block with NumPy. Tables
+    are cached by waveform, amplitude, offset and the channel settings that affect the
+    conversion, and the least recently used ones are dropped once there are more than
+    ``cache_size``. Channels without a waveform hold their current value.
+
+    :param MCP4728 dac: The DAC to play on
+    :param float sample_rate: The rate frames will be played at, in frames per second, used
+        to turn frequencies into phase steps
+    :param int table_size: The number of entries in each table. Must be a power of two.
+        Defaults to :const:`256`
+    :param int cache_size: The most tables to keep. Defaults to :const:`16`
+
+    .. code-block:: python
+
+        oscillator = adafruit_mcp4728_wavetable.Oscillator(mcp4728, sample_rate=2000)
+        sine = adafruit_mcp4728_wavetable.Waveform.SINE
+        oscillator.set_channel(0, sine, frequency=50)
+        oscillator.set_channel(1, sine, frequency=50, phase=0.25)
+        scheduler = adafruit_mcp4728_scheduler.SampleScheduler(mcp4728, rate=2000)
+        scheduler.play(oscillator.frames(2000))
+    """
+
+    def __init__(
+        self, dac: MCP4728, sample_rate: float, table_size: int = 256, cache_size: int = 16
+    ) -> None:
+        if sample_rate <= 0:
+            raise AttributeError("`sample_rate` must be greater than 0")
+        if table_size < 2 or table_size > 2**16 or table_size & (table_size - 1):
+            raise AttributeError("`table_size` must be a power of two from 2 to 65536")
+        if cache_size < 1:
+            raise AttributeError("`cache_size` must be at least 1")
+        self.dac = dac
+        self.sample_rate = sample_rate
+        self.table_size = table_size
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = {}
+        # cache keys from least to most recently used
+        self._cache_order = []
+        # the top bits of a phase are the table index
+        self._shift = 33 - table_size.bit_length()
+        self._tables = [None, None, None, None]
+        self._phases = [0, 0, 0, 0]
+        self._increments = [0, 0, 0, 0]
+
+    def set_channel(
+        self,
+        index: int,
+        waveform: Union[int, Sequence[float]] = Waveform.SINE,
+        frequency: float = 1.0,
+        amplitude: Optional[float] = None,
+        offset: Optional[float] = None,
+        phase: float = 0.0,
+    ) -> None:
+        """Starts a channel playing a waveform. The table is made with the channel's current
+        vref, gain, power-down mode and calibration and the DAC's vdd, so this needs calling
+        again after changing those. Voltages outside the channel's range are clipped.
+
+        :param int index: The channel index, from 0 for channel A to 3 for channel D
+        :param waveform: A ``Waveform``, or one period of any waveform as a sequence of
+            samples from -1.0 to 1.0, which is resampled to fit the table. Defaults to
+            ``Waveform.SINE``
+        :param float frequency: The frequency in Hz. Defaults to :const:`1.0`
+        :param float amplitude: The peak voltage either side of ``offset``. Defaults to half
+            the channel's range
+        :param float offset: The voltage the waveform is centered on. Defaults to the middle
+            of the channel's range
+        :param float phase: Where in the period to start, from 0.0 to 1.0. Defaults to
+            :const:`0.0`
+        """
+        if index not in {0, 1, 2, 3}:
+            raise AttributeError("`index` must be from 0 to 3")
+        if frequency < 0:
+            raise AttributeError("`frequency` must not be negative")
+        if isinstance(waveform, int):
+            if not Waveform.is_valid(waveform):
+                raise AttributeError("waveform must be a `Waveform` or a sequence of samples")
+        else:
+            if not waveform:
+                raise AttributeError("`waveform` must contain at least one sample")
+            waveform = tuple(waveform)
+        # pylint:disable=protected-access
+        self.dac._load()
+        channel = self.dac._channels[index]
+        low = channel._to_voltage(0)
+        high = channel._to_voltage(2**12 - 1)
+        if offset is None:
+            offset = (low + high) / 2
+        if amplitude is None:
+            amplitude = (high - low) / 2
+
+        self._tables[index] = self._table(channel, waveform, amplitude, offset)
+        self._increments[index] = int(frequency / self.sample_rate * 2**32) & 0xFFFFFFFF
+        self._phases[index] = int(phase % 1.0 * 2**32) & 0xFFFFFFFF
+
+    def stop_channel(self, index: int) -> None:
+        """Stops playing a waveform on a channel, which then holds its current value
+
+        :param int index: The channel index, from 0 for channel A to 3 for channel D
+        """
+        if index not in {0, 1, 2, 3}:
+            raise AttributeError("`index` must be from 0 to 3")
+        self._tables[index] = None
+
+    def frames(self, count: int) -> bytearray:
+        """Makes the next ``count`` frames as packed Fast Write frames, ready to pass to
+        :meth:`MCP4728.stream` or :meth:`adafruit_mcp4728_scheduler.SampleScheduler.play`
+
+        :param int count: The number of frames to make
+        """
+        if count < 0:
+            raise AttributeError("`count` must not be negative")
+        state = self.dac._state  # pylint:disable=protected-access
+        shift = self._shift
+        if np is not None:
+            return self._frames_numpy(count, state, shift)
+
+        buf = bytearray(count * 8)
+        for index in range(4):
+            table = self._tables[index]
+            start = index * 2
+            if table is None:
+                high_byte = state[start]
+                low_byte = state[start + 1]
+                for position in range(start, len(buf), 8):
+                    buf[position] = high_byte
+                    buf[position + 1] = low_byte
+                continue
+            phase = self._phases[index]
+            increment = self._increments[index]
+            for position in range(start, len(buf), 8):
+                word = table[phase >> shift]
+                buf[position] = word >> 8
+                buf[position + 1] = word & 0xFF
+                phase = (phase + increment) & 0xFFFFFFFF
+            self._phases[index] = phase
+        return buf
+
+    def _frames_numpy(self, count: int, state: bytearray, shift: int) -> bytearray:
+        frames = np.empty((count, 4), dtype=">u2")
+        steps = np.arange(count, dtype=np.uint64)
+        for index in range(4):
+            table = self._tables[index]
+            if table is None:
+                frames[:, index] = state[index * 2] << 8 | state[index * 2 + 1]
+                continue
+            phase = self._phases[index]
+            increment = self._increments[index]
+            phases = (steps * increment + phase) & 0xFFFFFFFF
+            frames[:, index] = np.frombuffer(table, dtype=np.uint16)[phases >> shift]
+            self._phases[index] = (phase + count * increment) & 0xFFFFFFFF
+        return bytearray(frames.tobytes())
+
+    def play(self, count: int, block_size: int = 256, chunk_size: int = 32) -> None:
+        """Streams the next ``count`` frames to the DAC as fast as the bus allows, making
+        them ``block_size`` at a time. Use :meth:`frames` with
+        :class:`adafruit_mcp4728_scheduler.SampleScheduler` to play them at
+        :attr:`sample_rate` instead.
+
+        :param int count: The number of frames to play
+        :param int block_size: The number of frames to make at a time. Defaults to
+            :const:`256`
+        :param int chunk_size: The number of frames in each I2C write. Defaults to
+            :const:`32`
+        """
+        if block_size < 1:
+            raise AttributeError("`block_size` must be at least 1")
+        while count > 0:
+            block = min(count, block_size)
+            self.dac.stream(self.frames(block), chunk_size)
+            count -= block
+
+    def _table(
+        self,
+        channel: Channel,
+        waveform: Union[int, Tuple[float, ...]],
+        amplitude: float,
+        offset: float,
+    ) -> array:
+        # pylint:disable=protected-access
+        key = (
+            waveform,
+            amplitude,
+            offset,
+            channel.vref,
+            channel.gain,
+            channel.power_down,
+            self.dac.vdd,
+            channel._calibration_offset,
+            channel._calibration_gain,
+            channel._calibration_table,
+        )
+        table = self._cache.get(key)
+        if table is not None:
+            self.cache_hits += 1
+            self._cache_order.remove(key)
+            self._cache_order.append(key)
+            return table
+
+        self.cache_misses += 1
+        size = self.table_size
+        power = channel.power_down << 12
+        table = array("H", [0] * size)
+        for entry in range(size):
+            sample = self._sample(waveform, entry / size)
+            raw_value = int(channel._to_raw_value(offset + amplitude * sample) + 0.5)
+            table[entry] = power | min(max(raw_value, 0), 2**12 - 1)
+
+        self._cache[key] = table
+        self._cache_order.append(key)
+        if len(self._cache_order) > self.cache_size:
+            del self._cache[self._cache_order.pop(0)]
+        return table
+
+    @staticmethod
+    def _sample(waveform: Union[int, Tuple[float, ...]], position: float) -> float:
+        """The waveform's value, from -1.0 to 1.0, at a position from 0.0 to 1.0 through its
+        period"""
+        if waveform == Waveform.SINE:
+            return sin(2 * pi * position)
+        if waveform == Waveform.TRIANGLE:
+            # starts at 0 rising, like the sine
+            if position < 0.25:
+                return 4 * position
+            if position < 0.75:
+                return 2 - 4 * position
+            return 4 * position - 4
+        if waveform == Waveform.SAW:
+            return 2 * position - 1
+        # arbitrary waveforms are interpolated between their samples
+        place = position * len(waveform)
+        sample = int(place)
+        following = waveform[(sample + 1) % len(waveform)]
+        return waveform[sample] + (following - waveform[sample]) * (place - sample)
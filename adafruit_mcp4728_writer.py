@@ -0,0 +1,169 @@
+# SPDX-FileCopyrightText: 2026 agent
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`adafruit_mcp4728_writer`
+================================================================================
+
+Writes to a Microchip MCP4728 DAC from a background thread
+
+
+* Author(s): agent
+
+Implementation Notes
+--------------------
+
+Needs thread support, as on CPython with Blinka.
+"""
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_MCP4728.git"
+
+import threading
+
+import adafruit_mcp4728
+from adafruit_mcp4728 import MCP4728
+
+try:
+    from typing import Sequence
+except ImportError:
+    pass
+
+
+class BackgroundWriter:
+    """Writes channel values to an :class:`MCP4728` from a background thread, so that the
+    threads producing the values never wait on the I2C bus.
+
+    Only the newest value given for each channel is kept until the writer thread gets to it,
+    so values that are replaced before they are written are dropped. Each time the writer
+    thread wakes up it sends every changed channel together, using a Fast Write frame when
+    three or more channels changed. Once the writer has started, the DAC should only be used
+    through it until it is closed. Needs thread support, as on CPython with Blinka.
+
+    :param MCP4728 dac: The DAC to write to
+
+    .. code-block:: python
+
+        with adafruit_mcp4728_writer.BackgroundWriter(mcp4728) as writer:
+            while running:
+                writer.set_raw_value(0, next_value())
+    """
+
+    def __init__(self, dac: MCP4728) -> None:
+        # the writes are built from the cached settings, so those must be read first
+        dac._load()  # pylint:disable=protected-access
+        self.dac = dac
+        self.coalesced = 0
+        """The number of values replaced by newer ones before they were written"""
+        self._values = [0, 0, 0, 0]
+        self._changed = 0
+        self._busy = False
+        self._closed = False
+        self._error = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "BackgroundWriter":
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+        self.close()
+
+    def set_raw_value(self, index: int, value: int) -> None:
+        """Queues a new native 12-bit value for one channel, without waiting for it to be
+        written.
+
+        :param int index: The channel index, from 0 for channel A to 3 for channel D
+        :param int value: The 12-bit value
+        """
+        if index not in {0, 1, 2, 3}:
+            raise AttributeError("`index` must be from 0 to 3")
+        if value < 0 or value > (2**12 - 1):
+            raise AttributeError(
+                f"`raw_value` must be a 12-bit integer between 0 and {(2**12 - 1)}"
+            )
+        with self._condition:
+            self._check()
+            if self._changed & 1 << index:
+                self.coalesced += 1
+            self._values[index] = value
+            self._changed |= 1 << index
+            self._condition.notify_all()
+
+    def set_raw_values(self, values: Sequence[int]) -> None:
+        """Queues new native 12-bit values for all four channels, without waiting for them
+        to be written.
+
+        :param values: The four 12-bit values, in channel order A to D
+        """
+        if len(values) != 4:
+            raise AttributeError("`values` must contain one value for each of the four channels")
+        for value in values:
+            if value < 0 or value > (2**12 - 1):
+                raise AttributeError(
+                    f"`raw_value` must be a 12-bit integer between 0 and {(2**12 - 1)}"
+                )
+        with self._condition:
+            self._check()
+            self.coalesced += adafruit_mcp4728._CHANNEL_COUNT[self._changed]
+            self._values[:] = values
+            self._changed = 0b1111
+            self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Waits until every queued value has been written"""
+        with self._condition:
+            while (self._changed or self._busy) and self._error is None:
+                self._condition.wait()
+            self._check()
+
+    def close(self) -> None:
+        """Writes any queued values, then stops the writer thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        with self._condition:
+            if self._error is not None:
+                raise self._error
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise self._error
+        if self._closed:
+            raise RuntimeError("BackgroundWriter is closed")
+
+    def _run(self) -> None:
+        # pylint:disable=protected-access
+        dac = self.dac
+        while True:
+            with self._condition:
+                while not self._changed and not self._closed:
+                    self._condition.wait()
+                if not self._changed:
+                    return
+                changed = self._changed
+                values = list(self._values)
+                self._changed = 0
+                self._busy = True
+
+            try:
+                # a reset since the last write leaves the settings to be read again
+                dac._load()
+                for index in range(4):
+                    if changed & 1 << index:
+                        dac._store_value(index, values[index])
+                dac._pending |= changed << adafruit_mcp4728._VALUE_FIELD
+                dac._flush()
+            except Exception as error:  # pylint:disable=broad-except
+                with self._condition:
+                    self._error = error
+                    self._busy = False
+                    self._condition.notify_all()
+                return
+
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
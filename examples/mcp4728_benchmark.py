@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2026 agent
+# SPDX-License-Identifier: MIT
+
+# Runs the driver's common operations against the simulated bus and reports, for each one,
+# the Python time per call, the bytes and transactions it puts on the wire, and the most
+# updates per second the bus allows at standard, fast and high speed clock rates.
+
+import time
+
+import adafruit_mcp4728
+from adafruit_mcp4728_sim import SimulatedI2C, SimulatedMCP4728
+
+ITERATIONS = 2000
+CLOCK_RATES = (100_000, 400_000, 3_400_000)
+
+i2c = SimulatedI2C(frequency=400_000)
+# no EEPROM write delay, so save_settings measures the driver rather than the wait
+SimulatedMCP4728(i2c, eeprom_write_time=0.0)
+mcp4728 = adafruit_mcp4728.MCP4728(i2c)
+frame = bytes(8)
+
+
+def single_channel(i):
+    mcp4728.channel_a.raw_value = i & 0xFFF
+
+
+def four_channels(i):
+    value = i & 0xFFF
+    mcp4728.set_raw_values((value, value, value, value))
+
+
+def vref_change(i):
+    mcp4728.channel_b.vref = i & 1
+
+
+def gain_change(i):
+    mcp4728.channel_b.gain = (i & 1) + 1
+
+
+def save_settings(i):
+    mcp4728.channel_c.raw_value = i & 0xFFF
+    mcp4728.save_settings()
+
+
+def readback(i):
+    mcp4728.refresh()
+
+
+def fast_write_frame(i):
+    mcp4728.stream(frame)
+
+
+BENCHMARKS = (
+    ("single channel set", single_channel),
+    ("four channel update", four_channels),
+    ("vref change", vref_change),
+    ("gain change", gain_change),
+    ("save_settings", save_settings),
+    ("readback", readback),
+    ("Fast Write frame", fast_write_frame),
+)
+
+print(
+    f"{'operation':<20}{'us/call':>9}{'bytes':>7}{'xfers':>7}"
+    + "".join(f"{rate // 1000:>9}kHz" for rate in CLOCK_RATES)
+)
+for name, function in BENCHMARKS:
+    i2c.reset_stats()
+    start = time.monotonic_ns()
+    for i in range(ITERATIONS):
+        function(i)
+    overhead = (time.monotonic_ns() - start) / 1e9 / ITERATIONS
+    wire_time = i2c.elapsed / ITERATIONS
+    rates = ""
+    for rate in CLOCK_RATES:
+        # the modeled wire time scales inversely with the clock rate
+        rates += f"{1 / (wire_time * i2c.frequency / rate):>12.0f}"
+    print(
+        f"{name:<20}{overhead * 1e6:>9.1f}"
+        + f"{(i2c.bytes_written + i2c.bytes_read) / ITERATIONS:>7.1f}"
+        + f"{i2c.transactions / ITERATIONS:>7.2f}"
+        + rates
+    )